@@ -0,0 +1,293 @@
+"""Background account deletion in small, resumable steps.
+
+`DELETE /api/users/{id}` only deactivates the user and records an
+AccountDeletionJob. A worker started from the app lifespan then removes the
+account's data one chunk per transaction, in phases:
+
+  posts     the user's posts, through moderation.batch_delete_posts (their
+            comments, likes and images go by ON DELETE CASCADE)
+  comments  the user's remaining comments, with the replies under them
+  likes     the user's likes, decrementing Post.like_count
+  user      the user row itself, once nothing else of the user's is left
+
+A worker whose principal cache (app.principals) still holds the user can
+write a post, comment or like after that phase has finished. The user step
+checks for such rows first and sends the job back to the earliest phase
+that has some, so the DELETE is not left failing on the foreign keys.
+
+Every step selects what is still left for the user, so rerunning a step
+after a crash is harmless. A worker holds a lease on its job (locked_until)
+that it renews on every step; jobs whose lease expired are picked up again,
+by this process or another one.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.cache import response_cache
+from app.database import SessionLocal
+from app.models import AccountDeletionJob, Comment, Like, Post, User
+from app.moderation import batch_delete_posts
+from app.popular import popular_ranking
+from app.principals import principal_cache
+
+logger = logging.getLogger(__name__)
+
+ACCOUNT_DELETION_CHUNK_SIZE = int(os.getenv("ACCOUNT_DELETION_CHUNK_SIZE", "200"))
+ACCOUNT_DELETION_POLL_INTERVAL = float(
+    os.getenv("ACCOUNT_DELETION_POLL_INTERVAL", "30")
+)
+ACCOUNT_DELETION_LEASE_SECONDS = 60
+
+PHASES = ("posts", "comments", "likes", "user")
+
+
+def _delete_posts(db: Session, job: AccountDeletionJob, chunk_size: int) -> bool:
+    post_ids = db.scalars(
+        select(Post.post_id)
+        .where(Post.user_id == job.user_id)
+        .order_by(Post.post_id)
+        .limit(chunk_size)
+    ).all()
+    if not post_ids:
+        return False
+    # Recorded first so it commits together with the DELETE
+    job.posts_deleted += len(post_ids)
+    batch_delete_posts(db, post_ids, chunk_size=len(post_ids))
+    return True
+
+
+def _delete_comments(db: Session, job: AccountDeletionJob, chunk_size: int) -> bool:
+    rows = db.execute(
+        select(Comment.comment_id, Comment.post_id, Comment.parent_id)
+        .where(Comment.user_id == job.user_id)
+        .order_by(Comment.comment_id)
+        .limit(chunk_size)
+    ).all()
+    if not rows:
+        return False
+    comment_ids = [row.comment_id for row in rows]
+    post_ids = {row.post_id for row in rows}
+    # Replies under the deleted comments go with them (parent_id cascade)
+    db.execute(
+        delete(Comment)
+        .where(Comment.comment_id.in_(comment_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+    # Recount what the cascade touched instead of tracking each subtree
+    parent_ids = {row.parent_id for row in rows if row.parent_id is not None}
+    reply_counts = dict(
+        db.execute(
+            select(Comment.parent_id, func.count())
+            .where(Comment.parent_id.in_(parent_ids))
+            .group_by(Comment.parent_id)
+        ).all()
+    )
+    for parent_id in parent_ids:
+        db.execute(
+            update(Comment)
+            .where(Comment.comment_id == parent_id)
+            .values(
+                reply_count=reply_counts.get(parent_id, 0),
+                updated_at=Comment.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    comment_count = (
+        select(func.count(Comment.comment_id))
+        .where(Comment.post_id == Post.post_id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Post)
+        .where(Post.post_id.in_(post_ids))
+        .values(comment_count=comment_count, updated_at=Post.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    job.comments_deleted += len(comment_ids)
+    db.commit()
+    response_cache.invalidate(
+        *(f"post:{post_id}" for post_id in post_ids),
+        *(f"comments:{post_id}" for post_id in post_ids),
+        "posts",
+    )
+    return True
+
+
+def _delete_likes(db: Session, job: AccountDeletionJob, chunk_size: int) -> bool:
+    rows = db.execute(
+        select(Like.post_id, Like.is_liked)
+        .where(Like.user_id == job.user_id)
+        .order_by(Like.post_id)
+        .limit(chunk_size)
+    ).all()
+    if not rows:
+        return False
+    liked = [row.post_id for row in rows if row.is_liked]
+    db.execute(
+        delete(Like)
+        .where(
+            Like.user_id == job.user_id,
+            Like.post_id.in_([row.post_id for row in rows]),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if liked:
+        db.execute(
+            update(Post)
+            .where(Post.post_id.in_(liked))
+            .values(like_count=Post.like_count - 1, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+    job.likes_deleted += len(rows)
+    db.commit()
+    for post_id in liked:
+        popular_ranking.record(post_id, "like", -1)
+    response_cache.invalidate(*(f"post:{post_id}" for post_id in liked), "posts")
+    return True
+
+
+def _leftover_phase(db: Session, user_id: int) -> Optional[str]:
+    """The earliest phase that still has rows of the user, if any"""
+    for phase, column in (
+        ("posts", Post.user_id),
+        ("comments", Comment.user_id),
+        ("likes", Like.user_id),
+    ):
+        if db.scalar(select(column).where(column == user_id).limit(1)) is not None:
+            return phase
+    return None
+
+
+def _delete_user(db: Session, job: AccountDeletionJob, chunk_size: int) -> bool:
+    phase = _leftover_phase(db, job.user_id)
+    if phase is not None:
+        logger.info(
+            "Account deletion job %d: rows written during deletion, back to %s",
+            job.job_id,
+            phase,
+        )
+        job.phase = phase
+        db.commit()
+        return True
+    db.execute(
+        delete(User)
+        .where(User.user_id == job.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    job.status = "done"
+    job.finished_at = datetime.now()
+    job.locked_until = None
+    db.commit()
+    principal_cache.invalidate(job.user_id)
+    response_cache.invalidate(f"user:{job.user_id}", "posts")
+    return False
+
+
+_PHASE_STEPS = {
+    "posts": _delete_posts,
+    "comments": _delete_comments,
+    "likes": _delete_likes,
+    "user": _delete_user,
+}
+
+
+def run_step(db: Session, job: AccountDeletionJob, chunk_size: int) -> bool:
+    """Process one chunk of the job's current phase; False once the job is done"""
+    job.locked_until = datetime.now() + timedelta(
+        seconds=ACCOUNT_DELETION_LEASE_SECONDS
+    )
+    if _PHASE_STEPS[job.phase](db, job, chunk_size):
+        return True
+    if job.status == "done":
+        return False
+    job.phase = PHASES[PHASES.index(job.phase) + 1]
+    db.commit()
+    return True
+
+
+class AccountDeletionWorker:
+    def __init__(self, chunk_size: int = ACCOUNT_DELETION_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _claim(self) -> Optional[int]:
+        """Take the lease on the oldest unfinished job that nobody holds"""
+        now = datetime.now()
+        available = or_(
+            AccountDeletionJob.locked_until.is_(None),
+            AccountDeletionJob.locked_until < now,
+        )
+        with SessionLocal() as db:
+            for job_id in db.scalars(
+                select(AccountDeletionJob.job_id)
+                .where(AccountDeletionJob.status != "done", available)
+                .order_by(AccountDeletionJob.job_id)
+                .limit(10)
+            ):
+                claimed = db.execute(
+                    update(AccountDeletionJob)
+                    .where(AccountDeletionJob.job_id == job_id, available)
+                    .values(
+                        status="running",
+                        locked_until=now
+                        + timedelta(seconds=ACCOUNT_DELETION_LEASE_SECONDS),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                if claimed.rowcount == 1:
+                    return job_id
+        return None
+
+    def _step(self, job_id: int) -> bool:
+        with SessionLocal() as db:
+            job = db.get(AccountDeletionJob, job_id)
+            try:
+                return run_step(db, job, self.chunk_size)
+            except Exception as e:
+                db.rollback()
+                # Keep the lease until it expires so a failing job is retried
+                # at the lease interval, not in a tight loop
+                job.last_error = repr(e)
+                db.commit()
+                raise
+
+    async def drain(self):
+        """Run claimable jobs to completion, one chunk per transaction"""
+        while (job_id := await run_in_threadpool(self._claim)) is not None:
+            try:
+                while await run_in_threadpool(self._step, job_id):
+                    pass
+            except Exception:
+                logger.exception("Account deletion job %d failed", job_id)
+                return
+
+    def wake(self):
+        """Start on a new job now instead of at the next poll"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run(self, interval: float = ACCOUNT_DELETION_POLL_INTERVAL):
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Failed to run account deletion jobs")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+account_deletions = AccountDeletionWorker()
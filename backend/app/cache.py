@@ -0,0 +1,283 @@
+"""Response cache with strong ETags for read endpoints.
+
+Handlers wrap their payload construction in `response_cache.respond(...)`:
+the serialized body is cached under the request path + query string for the
+route's TTL, tagged with the entities it was built from ("post:1",
+"user:3", "posts", ...). Write handlers call `response_cache.invalidate()`
+with the matching tags. Every response carries an ETag (a hash of the body)
+and a matching If-None-Match is answered with 304 and no body.
+
+The in-process backend is a size-bounded LRU; when REDIS_URL is set the
+shared backend is used so invalidations reach every worker. Its calls are
+network round trips, so handlers running on the event loop use
+`invalidate_async()`, which moves them to the threadpool.
+
+Bodies built from a read replica (app.replicas sets request.state.read_replica)
+may predate a write whose invalidation already ran, and once stored would be
+served for the whole TTL, also to the writer whose reads are pinned to the
+primary. The backends therefore remember when each tag was last invalidated,
+and a replica body is not stored if one of its tags was invalidated within
+REPLICA_STALE_SECONDS of the build starting. Other replica bodies are cached
+like any other.
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.kvstore import get_shared_client
+from app.replicas import REPLICA_HEALTH_INTERVAL, REPLICA_MAX_LAG_SECONDS
+from app.serialization import dumps
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+# Seconds each cached route stays fresh; invalidation usually ends it sooner
+ROUTE_TTLS = {
+    "post_detail": 30,
+    "post_list": 10,
+    "post_search": 30,
+    "post_popular": 30,
+    "post_comments": 10,
+    "post_threads": 10,
+    "comment_replies": 10,
+    "user_profile": 60,
+}
+
+# How far behind a replica still in rotation can be: the lag it is allowed,
+# plus up to one health check before a replica lagging more is taken out
+REPLICA_STALE_SECONDS = REPLICA_MAX_LAG_SECONDS + REPLICA_HEALTH_INTERVAL
+
+Build = Callable[[], Tuple[object, Iterable[str]]]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+
+
+class LRUCacheBackend:
+    """In-process cache bounded by entry count and total body bytes"""
+
+    blocking = False
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._invalidated: Dict[str, float] = {}  # tag -> time.time()
+        self._pruned_at = 0.0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse, ttl: float, tags: Iterable[str]):
+        tags = frozenset(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, tags)
+            self._bytes += len(value.body)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        now = time.time()
+        with self._lock:
+            for tag in tags:
+                self._invalidated[tag] = now
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+            if now - self._pruned_at > REPLICA_STALE_SECONDS:
+                self._pruned_at = now
+                self._invalidated = {
+                    tag: at
+                    for tag, at in self._invalidated.items()
+                    if now - at <= REPLICA_STALE_SECONDS
+                }
+
+    def invalidated_since(self, tags: Iterable[str], since: float) -> bool:
+        with self._lock:
+            return any(self._invalidated.get(tag, 0) >= since for tag in tags)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._invalidated.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        value, _, tags = entry
+        self._bytes -= len(value.body)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend:
+    """Cache shared by all workers; tags are redis sets of cache keys"""
+
+    blocking = True  # every call is a redis round trip
+
+    def __init__(self, client, prefix: str = "respcache"):
+        self._client = client
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self._client.get(f"{self._prefix}:key:{key}")
+        if raw is None:
+            return None
+        etag, _, body = raw.partition(b"\n")
+        return CachedResponse(body=body, etag=etag.decode())
+
+    def set(self, key: str, value: CachedResponse, ttl: float, tags: Iterable[str]):
+        cache_key = f"{self._prefix}:key:{key}"
+        pipe = self._client.pipeline(transaction=True)
+        pipe.set(cache_key, value.etag.encode() + b"\n" + value.body, ex=int(ttl))
+        for tag in tags:
+            tag_key = f"{self._prefix}:tag:{tag}"
+            pipe.sadd(tag_key, cache_key)
+            pipe.expire(tag_key, int(max(ROUTE_TTLS.values())))
+        pipe.execute()
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        now = time.time()
+        for tag in tags:
+            tag_key = f"{self._prefix}:tag:{tag}"
+            keys = self._client.smembers(tag_key)
+            self._client.delete(tag_key, *keys)
+            self._client.set(
+                f"{self._prefix}:invalidated:{tag}",
+                repr(now),
+                ex=math.ceil(REPLICA_STALE_SECONDS),
+            )
+
+    def invalidated_since(self, tags: Iterable[str], since: float) -> bool:
+        pipe = self._client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.get(f"{self._prefix}:invalidated:{tag}")
+        return any(
+            value is not None and float(value) >= since for value in pipe.execute()
+        )
+
+    def clear(self):
+        pass  # entries expire on their own
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def _key(request: Request) -> str:
+        query = (
+            "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+        )
+        return f"{request.url.path}?{query}"
+
+    @staticmethod
+    def _response(request: Request, cached: CachedResponse, status: str) -> Response:
+        headers = {
+            "ETag": cached.etag,
+            "Cache-Control": "no-cache",
+            "X-Cache": status,
+        }
+        if etag_matches(request.headers.get("if-none-match"), cached.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=cached.body, media_type="application/json", headers=headers
+        )
+
+    def _store(
+        self, request: Request, route: str, payload, tags, started: float
+    ) -> CachedResponse:
+        body = dumps(payload)
+        cached = CachedResponse(body=body, etag=make_etag(body))
+        tags = tuple(tags)
+        if not self._maybe_stale(request, tags, started):
+            self.backend.set(self._key(request), cached, ROUTE_TTLS[route], tags)
+        return cached
+
+    def _maybe_stale(self, request: Request, tags, started: float) -> bool:
+        """Whether a replica may have built the body before replaying a write"""
+        if getattr(request.state, "read_replica", None) is None:
+            return False
+        return self.backend.invalidated_since(tags, started - REPLICA_STALE_SECONDS)
+
+    def respond(self, request: Request, route: str, build: Build) -> Response:
+        """Serve from cache, or call build() -> (payload, tags) and cache it"""
+        cached = self.backend.get(self._key(request))
+        if cached is not None:
+            return self._response(request, cached, "HIT")
+        started = time.time()
+        payload, tags = build()
+        return self._response(
+            request, self._store(request, route, payload, tags, started), "MISS"
+        )
+
+    def invalidate(self, *tags: str):
+        self.backend.invalidate_tags(tags)
+
+    async def invalidate_async(self, *tags: str):
+        """invalidate() for code on the event loop, which it must not block"""
+        if self.backend.blocking:
+            await run_in_threadpool(self.backend.invalidate_tags, tags)
+        else:
+            self.backend.invalidate_tags(tags)
+
+
+def create_response_cache() -> ResponseCache:
+    client = get_shared_client()
+    backend = RedisCacheBackend(client) if client is not None else LRUCacheBackend()
+    return ResponseCache(backend)
+
+
+response_cache = create_response_cache()
@@ -0,0 +1,100 @@
+"""In-memory category registry.
+
+Categories are effectively constant, so they are seeded once in the app
+lifespan and served from an immutable snapshot. The admin category CRUD
+endpoints reload the snapshot after committing, and the lifespan reloads it
+periodically so other workers pick up those changes too.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Mapping, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Category, CategoryStatus
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_REFRESH_INTERVAL = float(os.getenv("CATEGORY_REFRESH_INTERVAL", "300"))
+
+
+@dataclass(frozen=True)
+class CategoryEntry:
+    category_id: int
+    category_status: CategoryStatus
+
+    @property
+    def description(self) -> str:
+        return self.category_status.description
+
+
+class CategoryRegistry:
+    def __init__(self):
+        self._by_id: Mapping[int, CategoryEntry] = MappingProxyType({})
+
+    def __contains__(self, category_id: int) -> bool:
+        return category_id in self._by_id
+
+    def get(self, category_id: int) -> Optional[CategoryEntry]:
+        return self._by_id.get(category_id)
+
+    def all(self) -> List[CategoryEntry]:
+        return sorted(self._by_id.values(), key=lambda entry: entry.category_id)
+
+    def seed(self, db: Session):
+        """Insert a row for every CategoryStatus that has none (idempotent)
+
+        Workers starting together may race here; the unique constraint on
+        category_status makes the losing INSERTs no-ops instead of duplicates.
+        """
+        existing = set(db.scalars(select(Category.category_status)).all())
+        missing = [status for status in CategoryStatus if status not in existing]
+        if missing:
+            db.execute(
+                insert(Category)
+                .prefix_with("IGNORE", dialect="mysql")
+                .prefix_with("OR IGNORE", dialect="sqlite"),
+                [{"category_status": status} for status in missing],
+            )
+            db.commit()
+
+    def load(self, db: Session):
+        """Replace the snapshot with the current categories table"""
+        rows = db.execute(select(Category.category_id, Category.category_status)).all()
+        # Swap in a new read-only mapping; readers never see a partial update
+        self._by_id = MappingProxyType(
+            {
+                row.category_id: CategoryEntry(row.category_id, row.category_status)
+                for row in rows
+            }
+        )
+
+    def _seed_and_load(self):
+        with SessionLocal() as db:
+            self.seed(db)
+            self.load(db)
+
+    def _reload(self):
+        with SessionLocal() as db:
+            self.load(db)
+
+    async def startup(self):
+        await run_in_threadpool(self._seed_and_load)
+
+    async def run(self, interval: float = CATEGORY_REFRESH_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self._reload)
+            except Exception:
+                logger.exception("Failed to refresh the category registry")
+
+
+category_registry = CategoryRegistry()
@@ -0,0 +1,89 @@
+"""Reply threading for comments with a materialized path.
+
+Each comment stores the zero-padded ids of its ancestors and itself in
+`path` ("0000000012/0000000345/"). Sorting by path therefore yields a
+thread depth-first with siblings in creation order, and a whole subtree is
+one index range on (post_id, path): every descendant path sorts after the
+root's path and before the root's path with its trailing "/" replaced by
+"0", since those two characters are adjacent.
+"""
+
+from typing import List, Tuple
+
+from sqlalchemy import and_, delete, func, select, update
+
+from app.models import Comment
+
+MAX_COMMENT_DEPTH = 8  # replies below this are attached to the deepest level
+PATH_SEGMENT_WIDTH = 10
+_SEGMENT_LENGTH = PATH_SEGMENT_WIDTH + 1  # digits plus "/"
+
+
+def path_segment(comment_id: int) -> str:
+    return f"{comment_id:0{PATH_SEGMENT_WIDTH}d}/"
+
+
+def _subtree_upper_bound(path: str) -> str:
+    return path[:-1] + "0"
+
+
+def descendants_filter(post_id: int, path: str):
+    """Rows strictly below the comment at `path`"""
+    return and_(
+        Comment.post_id == post_id,
+        Comment.path > path,
+        Comment.path < _subtree_upper_bound(path),
+    )
+
+
+def subtree_filter(post_id: int, path: str):
+    """The comment at `path` and everything below it"""
+    return and_(
+        Comment.post_id == post_id,
+        Comment.path >= path,
+        Comment.path < _subtree_upper_bound(path),
+    )
+
+
+def reply_position(parent) -> Tuple[int, str, int]:
+    """(parent_id, path prefix, depth) for a new reply to `parent`.
+
+    `parent` needs comment_id, path and depth. Replies to comments at the
+    depth limit become siblings of them instead of nesting further.
+    """
+    if parent.depth + 1 >= MAX_COMMENT_DEPTH:
+        prefix = parent.path[:-_SEGMENT_LENGTH]
+        return int(prefix[-_SEGMENT_LENGTH:-1]), prefix, parent.depth
+    return parent.comment_id, parent.path, parent.depth + 1
+
+
+def adjust_reply_count(comment_id: int, delta: int):
+    """UPDATE comments SET reply_count = reply_count + delta (keeps updated_at)"""
+    return (
+        update(Comment)
+        .where(Comment.comment_id == comment_id)
+        .values(reply_count=Comment.reply_count + delta, updated_at=Comment.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def count_subtree(comment):
+    return (
+        select(func.count())
+        .select_from(Comment)
+        .where(subtree_filter(comment.post_id, comment.path))
+    )
+
+
+def delete_subtree(comment) -> List:
+    """DELETE statements removing `comment` and its replies, deepest first.
+
+    Deleting one level at a time keeps every statement valid under the
+    parent_id foreign key, whatever order the database visits rows in.
+    """
+    return [
+        delete(Comment)
+        .where(subtree_filter(comment.post_id, comment.path), Comment.depth == depth)
+        .execution_options(synchronize_session=False)
+        for depth in range(MAX_COMMENT_DEPTH - 1, comment.depth - 1, -1)
+    ]
@@ -0,0 +1,101 @@
+"""Database engine and connection pool settings, read from the environment.
+
+Size the pool per uvicorn worker: every worker process owns one sync and one
+async engine, so the database sees up to
+`workers * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW)` connections at peak. Each
+read replica in REPLICA_DATABASE_URLS gets a sync engine with the same pool
+settings (see app.replicas).
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+
+load_dotenv()
+
+# 비동기 드라이버 (MySQL: aiomysql, 테스트용 SQLite: aiosqlite)
+ASYNC_DRIVERS = {"mysql": "mysql+aiomysql", "sqlite": "sqlite+aiosqlite"}
+
+
+def to_async_url(url: str) -> str:
+    sync_url = make_url(url)
+    return sync_url.set(
+        drivername=ASYNC_DRIVERS[sync_url.get_backend_name()]
+    ).render_as_string(hide_password=False)
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def default_database_url() -> str:
+    user = os.getenv("DB_USER", "root")
+    password = os.getenv("DB_PASSWORD", "root")
+    host = os.getenv("DB_HOST", "localhost")
+    port = os.getenv("DB_PORT", "3306")
+    name = os.getenv("DB_NAME", "community")
+    return f"mysql+pymysql://{user}:{password}@{host}:{port}/{name}?charset=utf8mb4"
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    url: str
+    async_url: str
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 3600  # keep below MySQL wait_timeout
+    # Off by default: pool_recycle already retires stale connections, and a
+    # ping costs a round trip on every checkout
+    pool_pre_ping: bool = False
+    echo: bool = False
+    replica_urls: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        url = os.getenv("DATABASE_URL", default_database_url())
+        return cls(
+            url=url,
+            async_url=os.getenv("ASYNC_DATABASE_URL", to_async_url(url)),
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "3600")),
+            pool_pre_ping=env_bool("DB_POOL_PRE_PING", False),
+            echo=env_bool("DB_ECHO", False),
+            replica_urls=tuple(
+                url.strip()
+                for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",")
+                if url.strip()
+            ),
+        )
+
+    def engine_options(self, url: Optional[str] = None) -> dict:
+        """Keyword arguments shared by create_engine and create_async_engine
+
+        `url` defaults to the primary; pass a replica's to size its pool.
+        """
+        options = {
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "echo": self.echo,
+        }
+        url = make_url(url or self.url)
+        # In-memory SQLite uses a singleton pool that takes no sizing options
+        in_memory = url.database in (None, "", ":memory:")
+        if url.get_backend_name() != "sqlite" or not in_memory:
+            options.update(
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+            )
+        return options
+
+
+db_settings = DatabaseSettings.from_env()
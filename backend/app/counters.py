@@ -0,0 +1,113 @@
+"""Denormalized Post.like_count / Post.comment_count maintenance.
+
+Counters are changed with in-SQL increments (`SET n = n + 1`) inside the same
+transaction as the like/comment write, so concurrent writers never lose
+updates. `reconcile_counters` recomputes them from the source tables in
+bounded post_id ranges and can be run as `python -m app.counters`.
+"""
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Comment, Like, Post
+
+RECONCILE_BATCH_SIZE = 1000
+
+
+def adjust_counter(post_id: int, column, delta: int):
+    """UPDATE posts SET <column> = <column> + delta WHERE post_id = :post_id"""
+    return (
+        update(Post)
+        .where(Post.post_id == post_id)
+        .values({column: column + delta, Post.updated_at: Post.updated_at})
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def set_like(db: AsyncSession, user_id: int, post_id: int, liked: bool) -> bool:
+    """Idempotently like/unlike a post; returns True if the state changed.
+
+    Commits the like row and the like_count adjustment together.
+    """
+    changed = await db.execute(
+        update(Like)
+        .where(
+            Like.user_id == user_id,
+            Like.post_id == post_id,
+            Like.is_liked.is_(not liked),
+        )
+        .values(is_liked=liked)
+        .execution_options(synchronize_session=False)
+    )
+    if changed.rowcount == 0:
+        if not liked:
+            return False  # not liked (or no row): nothing to undo
+        exists = await db.scalar(
+            select(Like.is_liked).where(
+                Like.user_id == user_id, Like.post_id == post_id
+            )
+        )
+        if exists is not None:
+            return False  # already liked
+        db.add(Like(user_id=user_id, post_id=post_id, is_liked=True))
+
+    await db.execute(adjust_counter(post_id, Post.like_count, 1 if liked else -1))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request inserted the same like first; its increment won.
+        await db.rollback()
+        return False
+    return True
+
+
+def reconcile_counters(db: Session, batch_size: int = RECONCILE_BATCH_SIZE) -> int:
+    """Recompute like_count/comment_count for every post; returns posts scanned.
+
+    Each post_id range is updated and committed separately so no single
+    transaction holds locks on the whole posts table.
+    """
+    comment_count = (
+        select(func.count(Comment.comment_id))
+        .where(Comment.post_id == Post.post_id)
+        .scalar_subquery()
+    )
+    like_count = (
+        select(func.count())
+        .select_from(Like)
+        .where(Like.post_id == Post.post_id, Like.is_liked.is_(True))
+        .scalar_subquery()
+    )
+    scanned = 0
+    last_post_id = 0
+    while True:
+        post_ids = db.scalars(
+            select(Post.post_id)
+            .where(Post.post_id > last_post_id)
+            .order_by(Post.post_id)
+            .limit(batch_size)
+        ).all()
+        if not post_ids:
+            return scanned
+        db.execute(
+            update(Post)
+            .where(Post.post_id >= post_ids[0], Post.post_id <= post_ids[-1])
+            .values(
+                comment_count=comment_count,
+                like_count=like_count,
+                updated_at=Post.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        scanned += len(post_ids)
+        last_post_id = post_ids[-1]
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    with SessionLocal() as session:
+        print(f"Reconciled counters for {reconcile_counters(session)} posts")
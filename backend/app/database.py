@@ -1,33 +1,66 @@
-import os
+from contextlib import contextmanager
 
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-load_dotenv()
+from app.config import db_settings
+from app.pools import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
-DB_USER = os.getenv("DB_USER", "root")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "root")
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "3306")
-DB_NAME = os.getenv("DB_NAME", "community")
+DATABASE_URL = db_settings.url
+ASYNC_DATABASE_URL = db_settings.async_url
 
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
 
-# 엔진 생성 (pool_recycle=3600: 1시간마다 연결 재생성)
-engine = create_engine(
-    DATABASE_URL,
-    pool_recycle=3600,
-    pool_pre_ping=True,  # 연결 상태 확인
-    echo=True  # SQL 쿼리 로깅
+def _engine_options(poolclass, url=None) -> dict:
+    options = db_settings.engine_options(url)
+    if "pool_size" in options:
+        options["poolclass"] = poolclass
+    return options
+
+
+# 엔진 생성 (풀 크기/타임아웃/recycle 등은 app.config 환경변수로 설정)
+engine = create_engine(DATABASE_URL, **_engine_options(InstrumentedQueuePool))
+
+# 비동기 엔진 생성 (async def 핸들러에서 이벤트 루프를 막지 않도록)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **_engine_options(InstrumentedAsyncQueuePool)
 )
 
+
+# 읽기 전용 복제본 엔진 (라우팅과 헬스 체크는 app.replicas)
+replica_engines = [
+    create_engine(url, **_engine_options(InstrumentedQueuePool, url))
+    for url in db_settings.replica_urls
+]
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite only enforces foreign keys (and ON DELETE CASCADE) when asked to,
+    # per connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+for _bind in (engine, async_engine.sync_engine, *replica_engines):
+    if _bind.dialect.name == "sqlite":
+        event.listen(_bind, "connect", _enable_sqlite_foreign_keys)
+
 # 세션 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
-# Base 클래스 생성
-Base = declarative_base()
+# Base 클래스 생성 (제약조건 이름 규칙: Alembic 마이그레이션에서 이름으로 참조)
+NAMING_CONVENTION = {
+    "ix": "ix_%(column_0_label)s",
+    "uq": "uq_%(table_name)s_%(column_0_name)s",
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+    "pk": "pk_%(table_name)s",
+}
+Base = declarative_base(metadata=MetaData(naming_convention=NAMING_CONVENTION))
 
 
 def get_db():
@@ -35,4 +68,34 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@contextmanager
+def count_queries(bind=None):
+    """Collect the SQL statements executed on `bind` inside the block.
+
+    Usage (e.g. in a test, to pin an endpoint's query budget):
+
+        with count_queries(engine) as statements:
+            client.get("/api/posts/1")
+        assert len(statements) <= 3
+    """
+    bind = engine if bind is None else bind
+    statements = []
+
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _before_cursor_execute)
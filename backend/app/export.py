@@ -0,0 +1,116 @@
+"""Streaming NDJSON export of posts (and optionally their comments).
+
+Rows are read through a server-side cursor in `EXPORT_BATCH_SIZE` batches
+and each batch is encoded and yielded before the next one is fetched, so
+memory stays flat regardless of the export size, and a slow client only
+holds the stream (StreamingResponse waits on every send) rather than making
+the server buffer ahead.
+
+Posts are ordered by (updated_at, post_id). For incremental sync, resume
+with `since=<last updated_at>&after_post_id=<last post_id>`. updated_at
+only moves when a post itself is edited; counter updates (views, likes,
+comments) leave it alone, so an incremental sync does not refresh counts
+and a full export is needed for current ones.
+"""
+
+import json
+from contextlib import AsyncExitStack
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import and_, or_, select
+
+from app.database import async_engine
+from app.models import Comment, Post, User
+
+EXPORT_BATCH_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _posts_statement(since: Optional[datetime], after_post_id: int, category_id: int):
+    stmt = (
+        select(
+            Post.post_id,
+            Post.title,
+            Post.content,
+            Post.category_id,
+            Post.user_id,
+            User.nickname,
+            Post.view_count,
+            Post.like_count,
+            Post.comment_count,
+            Post.created_at,
+            Post.updated_at,
+        )
+        .join(User, User.user_id == Post.user_id)
+        .order_by(Post.updated_at, Post.post_id)
+    )
+    if since is not None:
+        stmt = stmt.where(
+            or_(
+                Post.updated_at > since,
+                and_(Post.updated_at == since, Post.post_id > after_post_id),
+            )
+        )
+    if category_id != -1:
+        stmt = stmt.where(Post.category_id == category_id)
+    return stmt
+
+
+async def _comments_by_post(conn, post_ids: List[int]) -> Dict[int, list]:
+    result = await conn.execute(
+        select(
+            Comment.comment_id,
+            Comment.post_id,
+            Comment.content,
+            Comment.user_id,
+            User.nickname,
+            Comment.created_at,
+            Comment.updated_at,
+        )
+        .join(User, User.user_id == Comment.user_id)
+        .where(Comment.post_id.in_(post_ids))
+        .order_by(Comment.post_id, Comment.created_at, Comment.comment_id)
+    )
+    comments: Dict[int, list] = {post_id: [] for post_id in post_ids}
+    for row in result.mappings():
+        comments[row["post_id"]].append(dict(row))
+    return comments
+
+
+async def stream_posts(
+    since: Optional[datetime] = None,
+    after_post_id: int = 0,
+    category_id: int = -1,
+    include_comments: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield NDJSON chunks, one chunk per batch of posts"""
+    stmt = _posts_statement(since, after_post_id, category_id)
+    async with AsyncExitStack() as stack:
+        conn = await stack.enter_async_context(async_engine.connect())
+        # An unbuffered (server-side) cursor owns its connection until it is
+        # exhausted, so the per-batch comment lookups need a second one
+        comments_conn = None
+        if include_comments:
+            comments_conn = await stack.enter_async_context(async_engine.connect())
+
+        result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.mappings().partitions():
+            posts = [dict(row) for row in rows]
+            if comments_conn is not None:
+                comments = await _comments_by_post(
+                    comments_conn, [post["post_id"] for post in posts]
+                )
+                for post in posts:
+                    post["comments"] = comments[post["post_id"]]
+            yield "".join(
+                json.dumps(post, default=_default, ensure_ascii=False) + "\n"
+                for post in posts
+            ).encode()
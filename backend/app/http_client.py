@@ -0,0 +1,77 @@
+"""Shared outbound HTTP client (Kakao OAuth and other upstream APIs).
+
+One pooled `httpx.AsyncClient` is created in the app lifespan and handed to
+handlers through the `get_http_client` dependency, so logins reuse warm
+keep-alive connections instead of paying DNS/TCP/TLS setup per request.
+Tests can override the dependency with a client built on
+`httpx.MockTransport`.
+"""
+
+import asyncio
+import os
+import random
+from typing import Optional
+
+import httpx
+from fastapi import Request
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "5"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "2"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# Connection failures are retried by the transport for every method (the
+# request was never sent); other failures only for idempotent methods.
+HTTP_CONNECT_RETRIES = 2
+HTTP_RETRY_ATTEMPTS = 3
+HTTP_RETRY_BACKOFF = 0.2
+HTTP_RETRY_BACKOFF_MAX = 2.0
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {502, 503, 504}
+
+
+def create_http_client(
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(retries=HTTP_CONNECT_RETRIES)
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(
+            connect=HTTP_CONNECT_TIMEOUT,
+            read=HTTP_READ_TIMEOUT,
+            write=HTTP_READ_TIMEOUT,
+            pool=HTTP_POOL_TIMEOUT,
+        ),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient, method: str, url: str, **kwargs
+) -> httpx.Response:
+    """Send a request, retrying idempotent methods with bounded backoff"""
+    attempts = HTTP_RETRY_ATTEMPTS if method.upper() in IDEMPOTENT_METHODS else 1
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or last_attempt:
+                return response
+        # Full jitter keeps a burst of failing logins from retrying in lockstep
+        delay = min(HTTP_RETRY_BACKOFF * 2**attempt, HTTP_RETRY_BACKOFF_MAX)
+        await asyncio.sleep(random.uniform(0, delay))
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
@@ -0,0 +1,284 @@
+"""Post image uploads and the background thumbnail pipeline.
+
+`UploadLimitMiddleware` rejects oversized upload requests with 413 before
+their body is read (by Content-Length, or by counting the bytes of a chunked
+body as they arrive), so nothing past MAX_UPLOAD_BYTES is ever spooled. The
+spooled upload is then hashed with SHA-256 in place and copied once, into
+storage under its content hash ("originals/ab/abcd….jpg"), so the same file
+uploaded twice is stored and processed once. The PostImage row is created
+as "pending"; resizing runs in a process pool (CPU-bound, off the event loop
+and the request path) and writes JPEG/PNG and WebP variants for every size in
+THUMBNAIL_SIZES before the row is marked "ready". Rows left pending by a
+restart are requeued at startup.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import response_cache
+from app.database import AsyncSessionLocal
+from app.models import PostImage
+from app.storage import ObjectStore, object_store
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for the multipart boundaries and part headers around the file
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+UPLOAD_PATH = re.compile(r"^/api/posts/\d+/images$")
+THUMBNAIL_SIZES = {"thumb": 160, "small": 480, "medium": 1080}  # longest edge
+
+# Leading bytes of the accepted formats -> file extension
+_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+STATUS_PENDING = "pending"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+
+def sniff_extension(head: bytes) -> Optional[str]:
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    for signature, extension in _SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    return None
+
+
+def hash_file(source: BinaryIO, limit: int = MAX_UPLOAD_BYTES) -> Tuple[str, int]:
+    """Read a file object chunk by chunk; returns (sha256, size)"""
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := source.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(status_code=413, detail="Image is too large")
+        digest.update(chunk)
+    return digest.hexdigest(), size
+
+
+class UploadLimitMiddleware:
+    """Rejects image upload requests larger than MAX_UPLOAD_BYTES, unread"""
+
+    def __init__(self, app, max_bytes: int = MAX_UPLOAD_BYTES + UPLOAD_FORM_OVERHEAD):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not UPLOAD_PATH.match(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            response = JSONResponse({"detail": "Image is too large"}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside body parsing, which passes HTTPException on
+                    raise HTTPException(status_code=413, detail="Image is too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def render_variants(source: str, out_dir: str, sizes: Dict[str, int]) -> dict:
+    """Resize one image into every size and format (runs in a worker process)"""
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        width, height = image.size
+        has_alpha = image.mode in ("RGBA", "LA", "P") and (
+            image.mode != "P" or "transparency" in image.info
+        )
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        variants = {}
+        for name, edge in sizes.items():
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            files = {}
+            if has_alpha:
+                files["png"] = os.path.join(out_dir, f"{name}.png")
+                resized.save(files["png"], "PNG", optimize=True)
+            else:
+                files["jpeg"] = os.path.join(out_dir, f"{name}.jpg")
+                resized.save(
+                    files["jpeg"], "JPEG", quality=85, optimize=True, progressive=True
+                )
+            files["webp"] = os.path.join(out_dir, f"{name}.webp")
+            resized.save(files["webp"], "WEBP", quality=80, method=4)
+            variants[name] = {
+                "width": resized.width,
+                "height": resized.height,
+                "files": files,
+            }
+    return {"width": width, "height": height, "variants": variants}
+
+
+class ImagePipeline:
+    def __init__(self, store: ObjectStore, workers: int = IMAGE_WORKERS):
+        self.store = store
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks = set()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def ingest(
+        self, db: AsyncSession, post_id: int, upload: UploadFile
+    ) -> PostImage:
+        """Store an upload and create its PostImage row (committed)"""
+        extension = sniff_extension(await upload.read(16))
+        if extension is None:
+            raise HTTPException(status_code=415, detail="Unsupported image type")
+        await upload.seek(0)
+
+        # Hash the spooled upload where it is; it is only copied into storage
+        sha256, size = await run_in_threadpool(hash_file, upload.file)
+        key = f"originals/{sha256[:2]}/{sha256}{extension}"
+        if not await run_in_threadpool(self.store.exists, key):
+            await upload.seek(0)
+            await run_in_threadpool(self.store.save_stream, key, upload.file)
+
+        image = PostImage(
+            post_id=post_id,
+            image_url=self.store.url(key),
+            original_filename=upload.filename,
+            storage_key=key,
+            content_hash=sha256,
+            byte_size=size,
+            status=STATUS_PENDING,
+        )
+        # The same content was already processed: reuse its variants
+        processed = (
+            await db.execute(
+                select(PostImage.width, PostImage.height, PostImage.variants)
+                .where(
+                    PostImage.content_hash == sha256,
+                    PostImage.status == STATUS_READY,
+                )
+                .limit(1)
+            )
+        ).first()
+        if processed:
+            image.width, image.height, image.variants = processed
+            image.status = STATUS_READY
+        db.add(image)
+        await db.commit()
+
+        if image.status == STATUS_PENDING:
+            self.schedule(image.post_image_id, post_id, key, sha256)
+        return image
+
+    def schedule(self, post_image_id: int, post_id: int, key: str, sha256: str):
+        task = asyncio.create_task(self._process(post_image_id, post_id, key, sha256))
+        # Keep a reference until done so the task isn't garbage collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, post_image_id: int, post_id: int, key: str, sha256: str):
+        loop = asyncio.get_running_loop()
+        out_dir = tempfile.mkdtemp(dir=self.store.temp_dir())
+        values = {"status": STATUS_FAILED}
+        try:
+            source = await run_in_threadpool(self.store.local_path, key)
+            result = await loop.run_in_executor(
+                self.executor, render_variants, str(source), out_dir, THUMBNAIL_SIZES
+            )
+            variants = {}
+            for name, variant in result["variants"].items():
+                urls = {}
+                for fmt, path in variant["files"].items():
+                    variant_key = (
+                        f"variants/{sha256[:2]}/{sha256}_{name}{Path(path).suffix}"
+                    )
+                    await run_in_threadpool(self.store.save, variant_key, Path(path))
+                    urls[fmt] = self.store.url(variant_key)
+                variants[name] = {
+                    "width": variant["width"],
+                    "height": variant["height"],
+                    **urls,
+                }
+            values = {
+                "status": STATUS_READY,
+                "width": result["width"],
+                "height": result["height"],
+                "variants": variants,
+            }
+        except asyncio.CancelledError:
+            raise  # shutting down; the row stays pending and is resumed later
+        except Exception:
+            logger.exception("Failed to process post image %d", post_image_id)
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(PostImage)
+                .where(PostImage.post_image_id == post_image_id)
+                .values(**values)
+            )
+            await db.commit()
+        await response_cache.invalidate_async(f"post:{post_id}")
+
+    async def resume_pending(self):
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(
+                select(
+                    PostImage.post_image_id,
+                    PostImage.post_id,
+                    PostImage.storage_key,
+                    PostImage.content_hash,
+                ).where(PostImage.status == STATUS_PENDING)
+            )
+            for row in rows:
+                self.schedule(*row)
+
+    async def shutdown(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+image_pipeline = ImagePipeline(object_store)
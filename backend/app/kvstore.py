@@ -0,0 +1,138 @@
+"""Shared key-value store used by the cross-worker backends.
+
+`get_shared_client()` returns a redis-py client when REDIS_URL is set (and
+the optional `redis` package is installed), otherwise None so callers fall
+back to their in-process backends. `FakeRedis` implements the small subset
+of the redis-py API those backends use, for tests and local development.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+
+def get_shared_client():
+    url = os.getenv("REDIS_URL")
+    if not url:
+        return None
+    if redis is None:
+        raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed")
+    return redis.Redis.from_url(url)
+
+
+class FakeRedis:
+    """Thread-safe in-memory stand-in for a redis-py client"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def _set_expiry(self, key: str, ex: Optional[float]):
+        if ex is None:
+            self._expires.pop(key, None)
+        else:
+            self._expires[key] = time.monotonic() + ex
+
+    def get(self, key: str):
+        with self._lock:
+            return self._data.get(key) if self._alive(key) else None
+
+    def set(self, key: str, value, ex: Optional[float] = None, nx: bool = False):
+        with self._lock:
+            if nx and self._alive(key):
+                return None
+            self._data[key] = value
+            self._set_expiry(key, ex)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._alive(key):
+                    removed += 1
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return removed
+
+    def incrby(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            value = int(self._data[key]) + amount if self._alive(key) else amount
+            self._data[key] = value
+            return value
+
+    def hincrby(self, key: str, field, amount: int = 1) -> int:
+        with self._lock:
+            if not self._alive(key):
+                self._data[key] = {}
+            hash_ = self._data[key]
+            hash_[str(field)] = int(hash_.get(str(field), 0)) + amount
+            return hash_[str(field)]
+
+    def hgetall(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._data[key]) if self._alive(key) else {}
+
+    def expire(self, key: str, seconds: float) -> bool:
+        with self._lock:
+            if not self._alive(key):
+                return False
+            self._set_expiry(key, seconds)
+            return True
+
+    def sadd(self, key: str, *members) -> int:
+        with self._lock:
+            if not self._alive(key):
+                self._data[key] = set()
+            before = len(self._data[key])
+            self._data[key].update(members)
+            return len(self._data[key]) - before
+
+    def smembers(self, key: str) -> set:
+        with self._lock:
+            return set(self._data[key]) if self._alive(key) else set()
+
+    def pipeline(self, transaction: bool = True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self._client = client
+        self._commands: List[tuple] = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        with self._client._lock:
+            results = [
+                getattr(self._client, name)(*args, **kwargs)
+                for name, args, kwargs in self._commands
+            ]
+        self._commands = []
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._commands = []
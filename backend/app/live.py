@@ -0,0 +1,223 @@
+"""Server-Sent Events for new posts and comments.
+
+Handlers `publish()` an event to a topic after their commit ("posts:-1" and
+"posts:<category_id>" for new posts, "comments:<post_id>" for new comments)
+and every open stream subscribed to that topic receives it. Event ids are the
+post/comment ids, which only grow, so a client reconnecting with
+Last-Event-ID is first sent what it missed by the endpoint's `replay`
+query, then switched to live events. Replay stops at LIVE_REPLAY_LIMIT
+events; when more were missed the client gets a "reset" event instead (with
+an empty id, so the browser forgets its Last-Event-ID) and should refetch
+the list before relying on the live events that follow.
+
+Each connection has a bounded buffer. A client that falls LIVE_CLIENT_BUFFER
+events behind is disconnected instead of buffering without limit; the
+browser reconnects on its own and catches up through Last-Event-ID.
+
+The broker only fans out within this process. With REDIS_URL set, events go
+through Redis pub/sub so that streams served by every worker see them (the
+blocking PUBLISH runs in the threadpool); otherwise `LocalPubSub` delivers
+them directly.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.kvstore import get_shared_client
+
+logger = logging.getLogger(__name__)
+
+LIVE_CLIENT_BUFFER = int(os.getenv("LIVE_CLIENT_BUFFER", "100"))
+LIVE_HEARTBEAT_SECONDS = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+LIVE_MAX_SUBSCRIBERS = int(os.getenv("LIVE_MAX_SUBSCRIBERS", "10000"))
+LIVE_REPLAY_LIMIT = 100
+LIVE_RETRY_MS = 3000
+SSE_MEDIA_TYPE = "text/event-stream"
+RESET_EVENT = "id:\nevent: reset\ndata: {}\n\n"
+
+# (event id, event type, JSON-serializable data)
+Event = Tuple[int, str, dict]
+# replay(after_event_id, limit): the first `limit` events after that id
+Replay = Callable[[int, int], Awaitable[List[Event]]]
+
+
+def format_event(event_id: int, event_type: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+class Subscription:
+    def __init__(self, topic: str, maxsize: int):
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def offer(self, event: Event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True  # the stream ends; the client resumes
+
+
+class LocalPubSub:
+    """Delivers published events straight to this process's broker"""
+
+    blocking = False  # delivers to asyncio queues; must run on the loop
+
+    def start(self, deliver: Callable[[str, Event], None]):
+        self._deliver = deliver
+
+    def publish(self, topic: str, event: Event):
+        self._deliver(topic, event)
+
+    def stop(self):
+        pass
+
+
+class RedisPubSub:
+    """Relays events through Redis pub/sub to the brokers of all workers"""
+
+    PREFIX = "live:"
+    blocking = True  # publish() is a redis round trip
+
+    def __init__(self, client):
+        self._client = client
+        self._pubsub = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, deliver: Callable[[str, Event], None]):
+        loop = asyncio.get_running_loop()
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(f"{self.PREFIX}*")
+
+        def listen():
+            try:
+                for message in self._pubsub.listen():
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    event = tuple(json.loads(message["data"]))
+                    loop.call_soon_threadsafe(
+                        deliver, channel[len(self.PREFIX) :], event
+                    )
+            except Exception:
+                if self._pubsub is not None:  # not closed by stop()
+                    logger.exception("Live event listener stopped")
+
+        self._thread = threading.Thread(target=listen, daemon=True)
+        self._thread.start()
+
+    def publish(self, topic: str, event: Event):
+        self._client.publish(f"{self.PREFIX}{topic}", json.dumps(event))
+
+    def stop(self):
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            pubsub.close()
+
+
+class LiveBroker:
+    def __init__(self, pubsub, buffer_size: int = LIVE_CLIENT_BUFFER):
+        self.pubsub = pubsub
+        self.buffer_size = buffer_size
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._count = 0
+
+    async def startup(self):
+        self.pubsub.start(self._deliver)
+
+    def shutdown(self):
+        self.pubsub.stop()
+
+    async def publish(self, topic: str, event_id: int, event_type: str, data: dict):
+        event = (event_id, event_type, data)
+        try:
+            if self.pubsub.blocking:
+                await run_in_threadpool(self.pubsub.publish, topic, event)
+            else:
+                self.pubsub.publish(topic, event)
+        except Exception:
+            # Live updates are best effort; the write itself has succeeded
+            logger.exception("Failed to publish live event to %s", topic)
+
+    def _deliver(self, topic: str, event: Event):
+        for subscription in self._subscriptions.get(topic, ()):
+            subscription.offer(event)
+
+    def _subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(topic, self.buffer_size)
+        self._subscriptions.setdefault(topic, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscriptions.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[subscription.topic]
+        self._count -= 1
+
+    def full(self) -> bool:
+        return self._count >= LIVE_MAX_SUBSCRIBERS
+
+    async def stream(
+        self,
+        topic: str,
+        last_event_id: Optional[int] = None,
+        replay: Optional[Replay] = None,
+        heartbeat: float = LIVE_HEARTBEAT_SECONDS,
+    ):
+        """SSE body: missed events since last_event_id, then live ones"""
+        # Subscribe before replaying so nothing published in between is lost;
+        # duplicates are skipped by id
+        subscription = self._subscribe(topic)
+        try:
+            yield f"retry: {LIVE_RETRY_MS}\n\n"
+            replayed = set()
+            if last_event_id is not None and replay is not None:
+                missed = await replay(last_event_id, LIVE_REPLAY_LIMIT + 1)
+                if len(missed) > LIVE_REPLAY_LIMIT:
+                    yield RESET_EVENT  # too far behind to catch up by replay
+                    missed = []
+                for event_id, event_type, data in missed:
+                    yield format_event(event_id, event_type, data)
+                    replayed.add(event_id)
+            while not subscription.overflowed:
+                try:
+                    event_id, event_type, data = await asyncio.wait_for(
+                        subscription.queue.get(), heartbeat
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if event_id in replayed:
+                    continue
+                if last_event_id is not None and event_id <= last_event_id:
+                    continue
+                yield format_event(event_id, event_type, data)
+        finally:
+            self._unsubscribe(subscription)
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def create_live_broker() -> LiveBroker:
+    client = get_shared_client()
+    pubsub = RedisPubSub(client) if client is not None else LocalPubSub()
+    return LiveBroker(pubsub)
+
+
+live_broker = create_live_broker()
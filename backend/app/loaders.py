@@ -0,0 +1,19 @@
+"""Eager-loading options per endpoint, matched to the response schemas.
+
+Each tuple loads exactly the relationships its response model serializes, so
+an endpoint issues a fixed number of statements regardless of result size.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import Comment, Post
+
+# PostResponse -> user, comments[] -> comments[].user, images[]
+POST_DETAIL_OPTIONS = (
+    joinedload(Post.user),
+    selectinload(Post.comments).joinedload(Comment.user),
+    selectinload(Post.post_images),
+)
+
+# CommentResponse -> user
+COMMENT_OPTIONS = (joinedload(Comment.user),)
@@ -1,41 +1,129 @@
-from fastapi import FastAPI, Depends, HTTPException, Request, Header
+from fastapi import FastAPI, Depends, HTTPException, Request, Header, Query
+from fastapi import File, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models import Post, User, Comment, Category, CategoryStatus
-from app.database import get_db
-from sqlalchemy import func
+from app.models import Post, User, Comment, Category
+from app.models import AccountDeletionJob, Notification
+from app.database import AsyncSessionLocal, async_engine, engine, replica_engines
+from app.database import get_async_db, get_db
+from app.pools import pool_status
+from app.metrics import MetricsMiddleware, instrument_engine
+from app.metrics import registry as metrics_registry
+from app.loaders import COMMENT_OPTIONS, POST_DETAIL_OPTIONS
+from app.counters import adjust_counter, reconcile_counters, set_like
+from app.principals import Principal, principal_cache
+from app.pagination import encode_cursor, decode_cursor, parse_cursor_datetime
+from app.search import get_search_backend, highlight, make_snippet, split_words
+from app.views import view_counter
+from app.cache import response_cache
+from app.categories import category_registry
+from app.comment_tree import (
+    adjust_reply_count,
+    count_subtree,
+    delete_subtree,
+    descendants_filter,
+    path_segment,
+    reply_position,
+)
+from app.popular import popular_ranking
+from app.moderation import batch_delete_posts, batch_move_posts
+from app.account_deletion import account_deletions
+from app.notifications import NotificationEvent, notifications
+from app.live import SSE_MEDIA_TYPE, live_broker, parse_last_event_id
+from app.ratelimit import client_ip, rate_limit
+from app.serialization import row_dict
+from app.replicas import StickyPrimaryMiddleware, get_read_db, replica_router
+from app.export import NDJSON_MEDIA_TYPE, stream_posts
+from app.images import UploadLimitMiddleware, image_pipeline
+from app.storage import LocalObjectStore, MEDIA_URL, object_store
+from app.http_client import (
+    create_http_client,
+    get_http_client,
+    request_with_retry,
+)
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
 import httpx
 import os
 from app.schemas import (
     UserResponse,
+    AccountDeletionJobResponse,
     UserCreate,
     UserUpdate,
     PostResponse,
+    PostPageResponse,
+    PostSearchPageResponse,
+    PostSummaryResponse,
     PostCreate,
     PostUpdate,
+    PostBatchDelete,
+    PostBatchMove,
+    PostBatchResponse,
+    PostImageResponse,
     CommentResponse,
+    CommentPageResponse,
     CommentCreate,
     CommentUpdate,
     KakaoToken,
+    NotificationPageResponse,
+    NotificationRead,
+    NotificationResponse,
+    UnreadCountResponse,
     CategoryResponse,
     CategoryCreate,
     CategoryUpdate,
     CategoryBase,
+    LikeResponse,
 )
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from typing import Optional
+from typing import Literal, Optional
 
 # OAuth2 configuration
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 # JWT settings
 SECRET_KEY = "QbHVQZNLI0zOluOrXAyEp96FDaEu+hPgi5gFdl8VCF8="  # 실제 운영환경에서는 환경변수로 관리
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await category_registry.startup()
+    await popular_ranking.startup()
+    app.state.http_client = create_http_client()
+    await image_pipeline.resume_pending()
+    await live_broker.startup()
+    await replica_router.startup()
+    tasks = [
+        asyncio.create_task(view_counter.run()),
+        asyncio.create_task(category_registry.run()),
+        asyncio.create_task(popular_ranking.run()),
+        asyncio.create_task(account_deletions.run()),
+        asyncio.create_task(notifications.run()),
+        asyncio.create_task(replica_router.run()),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await view_counter.flush()
+        await notifications.flush()
+        await image_pipeline.shutdown()
+        live_broker.shutdown()
+        await app.state.http_client.aclose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS 설정 추가
 origins = [
@@ -43,13 +131,37 @@ origins = [
     "http://127.0.0.1:3000",
 ]
 
+# Inside CORS so that 413s for oversized uploads still carry CORS headers
+app.add_middleware(UploadLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-DB-Queries",
+        "X-DB-Time-Ms",
+        "Retry-After",
+        "X-RateLimit-Limit",
+        "X-RateLimit-Remaining",
+        "X-RateLimit-Reset",
+    ],
 )
+app.add_middleware(StickyPrimaryMiddleware)
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+for replica_engine in replica_engines:
+    instrument_engine(replica_engine)
+
+# Uploaded media; other stores serve their own URLs
+if isinstance(object_store, LocalObjectStore):
+    app.mount(
+        MEDIA_URL,
+        StaticFiles(directory=object_store.root, check_dir=False),
+        name="media",
+    )
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -65,7 +177,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 async def get_current_user(
     auth: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     credentials_exception = HTTPException(
         status_code=401,
@@ -76,24 +188,60 @@ async def get_current_user(
     try:
         token = auth.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if user is None:
-        raise credentials_exception
-    return user
-
+    # Fast path: no DB round trip (nor pooled connection) for cached principals
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+    row = (
+        await db.execute(
+            select(User.user_id, User.is_active, User.is_admin).where(
+                User.user_id == user_id
+            )
+        )
+    ).first()
+    if row is None:
+        raise credentials_exception
+    principal = Principal(
+        user_id=row.user_id, is_active=row.is_active, is_admin=row.is_admin
+    )
+    principal_cache.put(principal)
+    return principal
+
+
+def get_viewer_key(
+    request: Request,
+    auth: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> str:
+    """Identify a viewer for view dedup and rate limits without a DB lookup"""
+    if auth is not None:
+        try:
+            payload = jwt.decode(auth.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+            if payload.get("sub") is not None:
+                return f"user:{payload['sub']}"
+        except JWTError:
+            pass
+    return f"ip:{client_ip(request)}"
+
+
+async def get_current_active_user(current_user: Principal = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
+async def get_current_admin_user(
+    current_user: Principal = Depends(get_current_active_user),
+):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return current_user
+
+
 @app.get("/")
 def read_root():
     return {"message": "Hello World"}
@@ -101,11 +249,16 @@ def read_root():
 
 # --- USER CRUD ---
 @app.get("/api/users/{user_id}", response_model=UserResponse)
-def get_user_profile(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+def get_user_profile(
+    request: Request, user_id: int, db: Session = Depends(get_read_db)
+):
+    def build():
+        user = db.query(User).filter(User.user_id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return UserResponse.model_validate(user), [f"user:{user_id}"]
+
+    return response_cache.respond(request, "user_profile", build)
 
 
 @app.put("/api/users/{user_id}", response_model=UserResponse)
@@ -119,18 +272,53 @@ def update_user_info(
     for key, value in update_data.items():
         setattr(user, key, value)
     db.commit()
+    principal_cache.invalidate(user_id)
+    response_cache.invalidate(f"user:{user_id}", "posts")
     db.refresh(user)
     return user
 
 
-@app.delete("/api/users/{user_id}")
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
+async def latest_deletion_job(db: AsyncSession, user_id: int):
+    return await db.scalar(
+        select(AccountDeletionJob)
+        .where(AccountDeletionJob.user_id == user_id)
+        .order_by(AccountDeletionJob.job_id.desc())
+        .limit(1)
+    )
+
+
+@app.delete(
+    "/api/users/{user_id}",
+    status_code=202,
+    response_model=AccountDeletionJobResponse,
+)
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Deactivate the user now; their data is removed by a background job"""
+    is_active = await db.scalar(select(User.is_active).where(User.user_id == user_id))
+    if is_active is None:
         raise HTTPException(status_code=404, detail="User not found")
-    db.delete(user)
-    db.commit()
-    return {"detail": "User deleted"}
+    job = await latest_deletion_job(db, user_id)
+    if job is None or job.status == "done":
+        await db.execute(
+            update(User).where(User.user_id == user_id).values(is_active=False)
+        )
+        job = AccountDeletionJob(user_id=user_id)
+        db.add(job)
+        await db.commit()
+    principal_cache.invalidate(user_id)
+    await response_cache.invalidate_async(f"user:{user_id}")
+    account_deletions.wake()
+    return job
+
+
+@app.get(
+    "/api/users/{user_id}/deletion", response_model=AccountDeletionJobResponse
+)
+async def get_account_deletion(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    job = await latest_deletion_job(db, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No deletion requested")
+    return job
 
 
 @app.post("/api/users", response_model=UserResponse)
@@ -143,12 +331,113 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 # --- POST CRUD ---
+@app.get("/api/posts/search", response_model=PostSearchPageResponse)
+def search_posts(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    category_id: int = -1,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    # Keyset on (score, post_id) like post_page, so deep pages don't make the
+    # backend rank and skip everything before them
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        after_score, after_post_id = after
+        if (
+            isinstance(after_score, bool)
+            or not isinstance(after_score, (int, float))
+            or not isinstance(after_post_id, int)
+        ):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = (float(after_score), after_post_id)
+    return response_cache.respond(
+        request,
+        "post_search",
+        lambda: (search_page(db, q, category_id, limit, after), ["posts"]),
+    )
+
+
+def search_page(
+    db: Session, q: str, category_id: int, limit: int, after: Optional[tuple]
+):
+    hits = get_search_backend(db).search(db, q, category_id, limit + 1, after)
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = encode_cursor(hits[-1].score, hits[-1].post_id)
+    if not hits:
+        return {"items": [], "next_cursor": None}
+
+    post_ids = [hit.post_id for hit in hits]
+    rows = {
+        row.post_id: row
+        for row in post_summary_query(db)
+        .add_columns(Post.content)
+        .filter(Post.post_id.in_(post_ids))
+        .all()
+    }
+    words = split_words(q)
+    items = []
+    for hit in hits:
+        row = rows.get(hit.post_id)
+        if row is None:  # deleted between ranking and fetch
+            continue
+        item = row._asdict()
+        content = item.pop("content")
+        item["score"] = hit.score
+        item["title_highlight"] = highlight(row.title, words)
+        item["snippet"] = make_snippet(content, words)
+        items.append(item)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@app.get("/api/posts/popular", response_model=list[PostSummaryResponse])
+def get_popular_posts(
+    request: Request,
+    category_id: int = -1,
+    window: Literal["24h", "7d", "30d"] = "24h",
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    def build():
+        post_ids = popular_ranking.top(category_id, window, limit)
+        rows = {
+            row.post_id: row
+            for row in post_summary_query(db).filter(Post.post_id.in_(post_ids))
+        }
+        items = [rows[post_id]._asdict() for post_id in post_ids if post_id in rows]
+        return items, ["posts"]
+
+    return response_cache.respond(request, "post_popular", build)
+
+
 @app.get("/api/posts/{post_id}", response_model=PostResponse)
-def get_post_by_id(post_id: int, db: Session = Depends(get_db)):
-    post = db.query(Post).filter(Post.post_id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-    return post
+def get_post_by_id(
+    request: Request,
+    post_id: int,
+    db: Session = Depends(get_read_db),
+    viewer: str = Depends(get_viewer_key),
+):
+    def build():
+        post = (
+            db.query(Post)
+            .options(*POST_DETAIL_OPTIONS)
+            .filter(Post.post_id == post_id)
+            .first()
+        )
+        if not post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        user_ids = {post.user_id} | {c.user_id for c in post.comments}
+        tags = [f"post:{post_id}", *(f"user:{uid}" for uid in user_ids)]
+        return PostResponse.model_validate(post), tags
+
+    response = response_cache.respond(request, "post_detail", build)
+    # Buffered in memory and flushed in batches by the lifespan task
+    if view_counter.record(post_id, viewer):
+        popular_ranking.record(post_id, "view")
+    return response
 
 
 @app.put("/api/posts/{post_id}", response_model=PostResponse)
@@ -157,10 +446,21 @@ def update_post(post_id: int, post_update: PostUpdate, db: Session = Depends(get
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     update_data = post_update.model_dump(exclude_unset=True)
+    category_id = update_data.get("category_id")
+    if category_id is not None and category_id not in category_registry:
+        raise HTTPException(status_code=400, detail="Category not found")
     for key, value in update_data.items():
         setattr(post, key, value)
     db.commit()
-    db.refresh(post)
+    response_cache.invalidate(f"post:{post_id}", "posts")
+    post = (
+        db.query(Post)
+        .options(*POST_DETAIL_OPTIONS)
+        .filter(Post.post_id == post_id)
+        .one()
+    )
+    get_search_backend(db).index_post(post)
+    popular_ranking.move_post(post_id, post.category_id)
     return post
 
 
@@ -171,33 +471,165 @@ def delete_post(post_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Post not found")
     db.delete(post)
     db.commit()
+    get_search_backend(db).remove_post(post_id)
+    popular_ranking.remove_post(post_id)
+    response_cache.invalidate(f"post:{post_id}", f"comments:{post_id}", "posts")
     return {"detail": "Post deleted"}
 
 
-@app.get("/api/posts", response_model=list[PostResponse])
-def get_posts(keyword: str = "", category_id: int = -1, db: Session = Depends(get_db)):
-    query = db.query(Post)
+def post_summary_query(db: Session):
+    """Columns of PostSummaryResponse as a single query (no ORM hydration)"""
+    return db.query(
+        Post.post_id,
+        Post.title,
+        Post.category_id,
+        Post.user_id,
+        User.nickname,
+        Post.view_count,
+        Post.comment_count,
+        Post.like_count,
+        Post.created_at,
+    ).join(User, User.user_id == Post.user_id)
+
+
+POST_SORT_COLUMNS = {
+    "latest": Post.created_at,
+    "likes": Post.like_count,
+    "comments": Post.comment_count,
+}
+
+
+@app.get("/api/posts", response_model=PostPageResponse)
+def get_posts(
+    request: Request,
+    keyword: str = "",
+    category_id: int = -1,
+    sort: Literal["latest", "likes", "comments"] = "latest",
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    return response_cache.respond(
+        request,
+        "post_list",
+        lambda: (
+            post_page(db, keyword, category_id, sort, cursor, limit),
+            ["posts"],
+        ),
+    )
+
+
+def post_page(
+    db: Session,
+    keyword: str,
+    category_id: int,
+    sort: str,
+    cursor: Optional[str],
+    limit: int,
+):
+    query = post_summary_query(db)
     if keyword:
-        query = query.filter(func.lower(Post.title).like(f"%{keyword.lower()}%"))  # type: ignore
+        query = get_search_backend(db).filter(db, query, keyword)
     if category_id != -1:
         query = query.filter(Post.category_id == category_id)  # type: ignore
-    return query.all()
 
+    # Keyset pagination on (sort column, post_id): each page is a bounded index
+    # range scan no matter how deep the client has scrolled.
+    sort_column = POST_SORT_COLUMNS[sort]
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        after_value, after_post_id = after
+        if sort == "latest":
+            after_value = parse_cursor_datetime(after_value)
+        elif not isinstance(after_value, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(
+            or_(
+                sort_column < after_value,
+                and_(sort_column == after_value, Post.post_id < after_post_id),
+            )
+        )
 
-@app.post("/api/posts", response_model=PostResponse)
+    rows = (
+        query.order_by(sort_column.desc(), Post.post_id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), last.post_id)
+    return {"items": [row._asdict() for row in rows], "next_cursor": next_cursor}
+
+
+@app.post(
+    "/api/posts",
+    response_model=PostResponse,
+    dependencies=[Depends(rate_limit("create_post", get_viewer_key))],
+)
 async def create_post(
     post: PostCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user),
 ):
+    if post.category_id not in category_registry:
+        raise HTTPException(status_code=400, detail="Category not found")
     db_post = Post(**post.model_dump(), user_id=current_user.user_id)
     db.add(db_post)
-    db.commit()
-    db.refresh(db_post)
+    await db.commit()
+    db_post = await db.scalar(
+        select(Post)
+        .options(*POST_DETAIL_OPTIONS)
+        .where(Post.post_id == db_post.post_id)
+        .execution_options(populate_existing=True)
+    )
+    get_search_backend(db).index_post(db_post)
+    popular_ranking.add_post(db_post.post_id, db_post.category_id, db_post.created_at)
+    await response_cache.invalidate_async("posts")
+    summary = PostSummaryResponse(
+        post_id=db_post.post_id,
+        title=db_post.title,
+        category_id=db_post.category_id,
+        user_id=db_post.user_id,
+        nickname=db_post.user.nickname,
+        created_at=db_post.created_at,
+    ).model_dump(mode="json")
+    for topic in ("posts:-1", f"posts:{db_post.category_id}"):
+        await live_broker.publish(topic, db_post.post_id, "post", summary)
     return db_post
 
 
+@app.post(
+    "/api/posts/{post_id}/images",
+    response_model=PostImageResponse,
+    dependencies=[Depends(rate_limit("upload_image", get_viewer_key))],
+)
+async def upload_post_image(
+    post_id: int,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """Store an image; thumbnails are generated in the background (status)"""
+    author_id = await db.scalar(select(Post.user_id).where(Post.post_id == post_id))
+    if author_id is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if author_id != current_user.user_id:
+        raise HTTPException(
+            status_code=403, detail="Not authorized to add images to this post"
+        )
+    image = await image_pipeline.ingest(db, post_id, file)
+    await response_cache.invalidate_async(f"post:{post_id}")
+    return image
+
+
 # --- COMMENT CRUD ---
+def comment_cache_tags(post_id: int) -> tuple:
+    # Post detail embeds comments; list pages show comment_count
+    return f"post:{post_id}", f"comments:{post_id}", "posts"
+
+
 @app.put("/api/comments/{comment_id}", response_model=CommentResponse)
 def update_comment(
     comment_id: int, comment_update: CommentUpdate, db: Session = Depends(get_db)
@@ -209,8 +641,13 @@ def update_comment(
     for key, value in update_data.items():
         setattr(comment, key, value)
     db.commit()
-    db.refresh(comment)
-    return comment
+    response_cache.invalidate(*comment_cache_tags(comment.post_id))
+    return (
+        db.query(Comment)
+        .options(*COMMENT_OPTIONS)
+        .filter(Comment.comment_id == comment_id)
+        .one()
+    )
 
 
 @app.delete("/api/comments/{comment_id}")
@@ -218,49 +655,252 @@ def delete_comment(comment_id: int, db: Session = Depends(get_db)):
     comment = db.query(Comment).filter(Comment.comment_id == comment_id).first()
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
-    db.delete(comment)
+    # Replies go with the comment they answer
+    removed = db.scalar(count_subtree(comment))
+    for statement in delete_subtree(comment):
+        db.execute(statement)
+    if comment.parent_id is not None:
+        db.execute(adjust_reply_count(comment.parent_id, -1))
+    db.execute(adjust_counter(comment.post_id, Post.comment_count, -removed))
     db.commit()
+    response_cache.invalidate(*comment_cache_tags(comment.post_id))
+    popular_ranking.record(comment.post_id, "comment", -removed)
     return {"detail": "Comment deleted"}
 
 
-@app.post("/api/posts/{post_id}/comments", response_model=CommentResponse)
+@app.post(
+    "/api/posts/{post_id}/comments",
+    response_model=CommentResponse,
+    dependencies=[Depends(rate_limit("create_comment", get_viewer_key))],
+)
 async def create_comment(
     post_id: int,
     comment: CommentCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Check if post exists
-    post = db.query(Post).filter(Post.post_id == post_id).first()
+    post = await db.scalar(select(Post.post_id).where(Post.post_id == post_id))
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
+    parent_id, path_prefix, depth = None, "", 0
+    if comment.parent_id is not None:
+        parent = (
+            await db.execute(
+                select(Comment.comment_id, Comment.path, Comment.depth).where(
+                    Comment.comment_id == comment.parent_id,
+                    Comment.post_id == post_id,
+                )
+            )
+        ).first()
+        if not parent:
+            raise HTTPException(status_code=404, detail="Parent comment not found")
+        parent_id, path_prefix, depth = reply_position(parent)
+
     db_comment = Comment(
-        **comment.model_dump(), post_id=post_id, user_id=current_user.user_id
+        content=comment.content,
+        post_id=post_id,
+        user_id=current_user.user_id,
+        parent_id=parent_id,
+        depth=depth,
     )
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await db.flush()  # the path ends with the comment's own id
+    db_comment.path = path_prefix + path_segment(db_comment.comment_id)
+    # Setting the path is not an edit; keep onupdate from bumping updated_at
+    db_comment.updated_at = db_comment.created_at
+    if parent_id is not None:
+        await db.execute(adjust_reply_count(parent_id, 1))
+    await db.execute(adjust_counter(post_id, Post.comment_count, 1))
+    await db.commit()
+    await response_cache.invalidate_async(*comment_cache_tags(post_id))
+    popular_ranking.record(post_id, "comment")
+    notifications.publish(
+        NotificationEvent(
+            kind="comment",
+            actor_id=current_user.user_id,
+            post_id=post_id,
+            comment_id=db_comment.comment_id,
+            parent_id=comment.parent_id,
+        )
+    )
+    db_comment = await db.scalar(
+        select(Comment)
+        .options(*COMMENT_OPTIONS)
+        .where(Comment.comment_id == db_comment.comment_id)
+        .execution_options(populate_existing=True)
+    )
+    await live_broker.publish(
+        f"comments:{post_id}",
+        db_comment.comment_id,
+        "comment",
+        CommentResponse.model_validate(db_comment).model_dump(mode="json"),
+    )
     return db_comment
 
 
+def comment_query(db: Session):
+    """Columns of CommentResponse, its user included, as a single query"""
+    return db.query(
+        Comment.content,
+        Comment.comment_id,
+        Comment.post_id,
+        Comment.user_id,
+        User.user_id.label("user__user_id"),
+        User.social_id.label("user__social_id"),
+        User.nickname.label("user__nickname"),
+        User.profile_image.label("user__profile_image"),
+        User.is_admin.label("user__is_admin"),
+        User.is_active.label("user__is_active"),
+        User.total_points.label("user__total_points"),
+        User.created_at.label("user__created_at"),
+        User.updated_at.label("user__updated_at"),
+        Comment.parent_id,
+        Comment.path,
+        Comment.depth,
+        Comment.reply_count,
+        Comment.created_at,
+        Comment.updated_at,
+    ).join(User, User.user_id == Comment.user_id)
+
+
+def comment_items(rows) -> list:
+    return [row_dict(row, {"user__": "user"}) for row in rows]
+
+
 @app.get("/api/posts/{post_id}/comments", response_model=list[CommentResponse])
-def get_post_comments(post_id: int, db: Session = Depends(get_db)):
-    comments = db.query(Comment).filter(Comment.post_id == post_id).all()
-    return comments
+def get_post_comments(
+    request: Request, post_id: int, db: Session = Depends(get_read_db)
+):
+    def build():
+        rows = (
+            comment_query(db)
+            .filter(Comment.post_id == post_id)
+            .order_by(Comment.path)  # threads depth-first
+            .all()
+        )
+        tags = [f"comments:{post_id}", *{f"user:{row.user_id}" for row in rows}]
+        return comment_items(rows), tags
+
+    return response_cache.respond(request, "post_comments", build)
+
+
+def comment_page(rows, limit: int, cursor_value):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(cursor_value(rows[-1]))
+    return {"items": comment_items(rows), "next_cursor": next_cursor}
+
+
+@app.get("/api/posts/{post_id}/threads", response_model=CommentPageResponse)
+def get_comment_threads(
+    request: Request,
+    post_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    """Top-level comments in creation order, each with its reply_count"""
+    after = decode_cursor(cursor, 1)
+    if after is not None and not isinstance(after[0], int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def build():
+        query = comment_query(db).filter(
+            Comment.post_id == post_id, Comment.parent_id.is_(None)
+        )
+        if after is not None:
+            query = query.filter(Comment.comment_id > after[0])
+        rows = query.order_by(Comment.comment_id).limit(limit + 1).all()
+        tags = [f"comments:{post_id}", *{f"user:{row.user_id}" for row in rows}]
+        return comment_page(rows, limit, lambda row: row.comment_id), tags
+
+    return response_cache.respond(request, "post_threads", build)
+
+
+@app.get("/api/comments/{comment_id}/replies", response_model=CommentPageResponse)
+def get_comment_replies(
+    request: Request,
+    comment_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_read_db),
+):
+    """The whole reply subtree of a comment, depth-first, in batches"""
+    after = decode_cursor(cursor, 1)
+    if after is not None and not isinstance(after[0], str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def build():
+        root = (
+            db.query(Comment.post_id, Comment.path)
+            .filter(Comment.comment_id == comment_id)
+            .first()
+        )
+        if not root:
+            raise HTTPException(status_code=404, detail="Comment not found")
+        query = comment_query(db).filter(descendants_filter(root.post_id, root.path))
+        if after is not None:
+            query = query.filter(Comment.path > after[0])
+        rows = query.order_by(Comment.path).limit(limit + 1).all()
+        tags = [f"comments:{root.post_id}", *{f"user:{row.user_id}" for row in rows}]
+        return comment_page(rows, limit, lambda row: row.path), tags
+
+    return response_cache.respond(request, "comment_replies", build)
+
+
+# --- LIKES ---
+async def like_response(db: AsyncSession, post_id: int, is_liked: bool):
+    like_count = await db.scalar(select(Post.like_count).where(Post.post_id == post_id))
+    return {"post_id": post_id, "is_liked": is_liked, "like_count": like_count}
+
+
+@app.put("/api/posts/{post_id}/like", response_model=LikeResponse)
+async def like_post(
+    post_id: int,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    post = await db.scalar(select(Post.post_id).where(Post.post_id == post_id))
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if await set_like(db, current_user.user_id, post_id, True):
+        await response_cache.invalidate_async("posts")
+        popular_ranking.record(post_id, "like")
+        notifications.publish(
+            NotificationEvent("like", actor_id=current_user.user_id, post_id=post_id)
+        )
+    return await like_response(db, post_id, True)
+
+
+@app.delete("/api/posts/{post_id}/like", response_model=LikeResponse)
+async def unlike_post(
+    post_id: int,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    post = await db.scalar(select(Post.post_id).where(Post.post_id == post_id))
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if await set_like(db, current_user.user_id, post_id, False):
+        await response_cache.invalidate_async("posts")
+        popular_ranking.record(post_id, "like", -1)
+    return await like_response(db, post_id, False)
 
 
 @app.delete("/api/posts/{post_id}/comments/{comment_id}")
 async def delete_comment(
     post_id: int,
     comment_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    comment = (
-        db.query(Comment)
-        .filter(Comment.comment_id == comment_id, Comment.post_id == post_id)
-        .first()
+    comment = await db.scalar(
+        select(Comment).where(
+            Comment.comment_id == comment_id, Comment.post_id == post_id
+        )
     )
 
     if not comment:
@@ -271,14 +911,27 @@ async def delete_comment(
             status_code=403, detail="Not authorized to delete this comment"
         )
 
-    db.delete(comment)
-    db.commit()
+    removed = await db.scalar(count_subtree(comment))
+    for statement in delete_subtree(comment):
+        await db.execute(statement)
+    if comment.parent_id is not None:
+        await db.execute(adjust_reply_count(comment.parent_id, -1))
+    await db.execute(adjust_counter(post_id, Post.comment_count, -removed))
+    await db.commit()
+    await response_cache.invalidate_async(*comment_cache_tags(post_id))
+    popular_ranking.record(post_id, "comment", -removed)
     return {"detail": "Comment deleted"}
 
 
 @app.get("/api/users/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
-    return current_user
+async def get_current_user_info(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    user = await db.get(User, current_user.user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
 # Kakao OAuth endpoints
@@ -290,8 +943,15 @@ async def get_kakao_url():
     }
 
 
-@app.post("/api/auth/kakao")
-async def kakao_login(token: KakaoToken, db: Session = Depends(get_db)):
+@app.post(
+    "/api/auth/kakao",
+    dependencies=[Depends(rate_limit("kakao_login", get_viewer_key))],
+)
+async def kakao_login(
+    token: KakaoToken,
+    db: AsyncSession = Depends(get_async_db),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
     try:
         print(f"[Backend] Starting Kakao login process with code: {token.code}")
 
@@ -306,80 +966,79 @@ async def kakao_login(token: KakaoToken, db: Session = Depends(get_db)):
 
         print(f"[Backend] Token request data: {token_request_data}")
 
-        async with httpx.AsyncClient() as client:
-            # Get access token
-            token_response = await client.post(
-                "https://kauth.kakao.com/oauth/token", data=token_request_data
-            )
-
-            print(f"[Backend] Token response status: {token_response.status_code}")
-            print(f"[Backend] Token response body: {token_response.text}")
+        # Get access token (not retried: the authorization code is single-use)
+        token_response = await client.post(
+            "https://kauth.kakao.com/oauth/token", data=token_request_data
+        )
 
-            if not token_response.is_success:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to get access token from Kakao: {token_response.text}",
-                )
+        print(f"[Backend] Token response status: {token_response.status_code}")
+        print(f"[Backend] Token response body: {token_response.text}")
 
-            token_data = token_response.json()
-            access_token = token_data.get("access_token")
+        if not token_response.is_success:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to get access token from Kakao: {token_response.text}",
+            )
 
-            if not access_token:
-                raise HTTPException(
-                    status_code=400, detail="No access token in Kakao response"
-                )
+        token_data = token_response.json()
+        access_token = token_data.get("access_token")
 
-            # Get user info
-            headers = {"Authorization": f"Bearer {access_token}"}
-            user_response = await client.get(
-                "https://kapi.kakao.com/v2/user/me", headers=headers
+        if not access_token:
+            raise HTTPException(
+                status_code=400, detail="No access token in Kakao response"
             )
 
-            print(f"[Backend] User info response status: {user_response.status_code}")
-            print(f"[Backend] User info response body: {user_response.text}")
+        # Get user info
+        headers = {"Authorization": f"Bearer {access_token}"}
+        user_response = await request_with_retry(
+            client, "GET", "https://kapi.kakao.com/v2/user/me", headers=headers
+        )
 
-            if not user_response.is_success:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to get user info from Kakao: {user_response.text}",
-                )
+        print(f"[Backend] User info response status: {user_response.status_code}")
+        print(f"[Backend] User info response body: {user_response.text}")
 
-            # Get user info from Kakao and create or update user
-            user_info = user_response.json()
-            kakao_id = str(user_info["id"])
-            kakao_account = user_info.get("kakao_account", {})
-            profile = kakao_account.get("profile", {})
-
-            # Check if user exists
-            user = db.query(User).filter(User.social_id == kakao_id).first()
-
-            if not user:
-                # Create new user
-                user = User(
-                    social_id=kakao_id,
-                    nickname=profile.get("nickname", "Anonymous"),
-                    profile_image=profile.get("profile_image_url"),
-                )
-                db.add(user)
-                db.commit()
-                db.refresh(user)
-
-            # Generate JWT access token
-            access_token = create_access_token(
-                data={"sub": str(user.user_id)},
-                expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        if not user_response.is_success:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to get user info from Kakao: {user_response.text}",
             )
 
-            return {
-                "user": {
-                    "user_id": user.user_id,
-                    "nickname": user.nickname,
-                    "profile_image": user.profile_image,
-                    "is_admin": user.is_admin,
-                    "total_points": user.total_points,
-                },
-                "access_token": access_token,
-            }
+        # Get user info from Kakao and create or update user
+        user_info = user_response.json()
+        kakao_id = str(user_info["id"])
+        kakao_account = user_info.get("kakao_account", {})
+        profile = kakao_account.get("profile", {})
+
+        # Check if user exists
+        user = await db.scalar(select(User).where(User.social_id == kakao_id))
+
+        if not user:
+            # Create new user
+            user = User(
+                social_id=kakao_id,
+                nickname=profile.get("nickname", "Anonymous"),
+                profile_image=profile.get("profile_image_url"),
+            )
+            db.add(user)
+            await db.commit()
+            await db.refresh(user)
+
+        # Generate JWT access token
+        access_token = create_access_token(
+            data={"sub": str(user.user_id)},
+            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        )
+
+        return {
+            "user": {
+                "user_id": user.user_id,
+                "nickname": user.nickname,
+                "profile_image": user.profile_image,
+                "is_admin": user.is_admin,
+                "total_points": user.total_points,
+            },
+            "access_token": access_token,
+        }
 
     except HTTPException as he:
         print(f"[Backend] HTTP Exception: {he.detail}")
@@ -392,8 +1051,15 @@ async def kakao_login(token: KakaoToken, db: Session = Depends(get_db)):
         )
 
 
-@app.get("/api/auth/kakao/callback")
-async def kakao_callback(code: str, db: Session = Depends(get_db)):
+@app.get(
+    "/api/auth/kakao/callback",
+    dependencies=[Depends(rate_limit("kakao_login", get_viewer_key))],
+)
+async def kakao_callback(
+    code: str,
+    db: AsyncSession = Depends(get_async_db),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
     # Exchange authorization code for access token
     token_request_data = {
         "grant_type": "authorization_code",
@@ -403,24 +1069,23 @@ async def kakao_callback(code: str, db: Session = Depends(get_db)):
         "redirect_uri": os.getenv("KAKAO_REDIRECT_URI"),
     }
 
-    async with httpx.AsyncClient() as client:
-        token_response = await client.post(
-            os.getenv("KAKAO_TOKEN_URI"), data=token_request_data
-        )
-        token_response.raise_for_status()
-        token_data = token_response.json()
+    token_response = await client.post(
+        os.getenv("KAKAO_TOKEN_URI"), data=token_request_data
+    )
+    token_response.raise_for_status()
+    token_data = token_response.json()
 
-        # Get user info from Kakao
-        headers = {"Authorization": f"Bearer {token_data['access_token']}"}
-        user_info_response = await client.get(
-            os.getenv("KAKAO_USER_INFO_URI"), headers=headers
-        )
-        user_info_response.raise_for_status()
-        kakao_user_info = user_info_response.json()
+    # Get user info from Kakao
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    user_info_response = await request_with_retry(
+        client, "GET", os.getenv("KAKAO_USER_INFO_URI"), headers=headers
+    )
+    user_info_response.raise_for_status()
+    kakao_user_info = user_info_response.json()
 
     # Find or create user
     kakao_id = str(kakao_user_info["id"])
-    user = db.query(User).filter(User.social_id == kakao_id).first()
+    user = await db.scalar(select(User).where(User.social_id == kakao_id))
 
     if not user:
         user = User(
@@ -430,8 +1095,8 @@ async def kakao_callback(code: str, db: Session = Depends(get_db)):
             is_active=True,
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
 
     # Create access token for our API
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -442,31 +1107,171 @@ async def kakao_callback(code: str, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+# --- NOTIFICATIONS ---
+@app.get("/api/notifications", response_model=NotificationPageResponse)
+async def get_notifications(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """The current user's notifications, newest first"""
+    before = decode_cursor(cursor, 1)
+    if before is not None and not isinstance(before[0], int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    query = (
+        select(
+            Notification.notification_id,
+            Notification.kind,
+            Notification.actor_id,
+            User.nickname.label("actor_nickname"),
+            Notification.post_id,
+            Notification.comment_id,
+            Notification.is_read,
+            Notification.created_at,
+        )
+        .join(User, User.user_id == Notification.actor_id)
+        .where(Notification.user_id == current_user.user_id)
+    )
+    if before is not None:
+        query = query.where(Notification.notification_id < before[0])
+    rows = (
+        await db.execute(
+            query.order_by(Notification.notification_id.desc()).limit(limit + 1)
+        )
+    ).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].notification_id)
+    return NotificationPageResponse(
+        items=[NotificationResponse.model_validate(row) for row in rows],
+        next_cursor=next_cursor,
+        unread_count=await notifications.unread_count(db, current_user.user_id),
+    )
+
+
+@app.get("/api/notifications/unread_count", response_model=UnreadCountResponse)
+async def get_unread_notification_count(
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return {"unread_count": await notifications.unread_count(db, current_user.user_id)}
+
+
+@app.post("/api/notifications/read", response_model=UnreadCountResponse)
+async def mark_notifications_read(
+    read: NotificationRead,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    query = update(Notification).where(
+        Notification.user_id == current_user.user_id,
+        Notification.is_read.is_(False),
+    )
+    if read.up_to is not None:
+        query = query.where(Notification.notification_id <= read.up_to)
+    await db.execute(query.values(is_read=True))
+    await db.commit()
+    # Recount rather than subtract: notifications may have arrived meanwhile
+    unread = await notifications.unread_count(db, current_user.user_id, refresh=True)
+    return {"unread_count": unread}
+
+
+# --- LIVE ---
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def live_response(topic: str, last_event_id: Optional[str], replay):
+    if live_broker.full():
+        raise HTTPException(status_code=503, detail="Too many live connections")
+    return StreamingResponse(
+        live_broker.stream(topic, parse_last_event_id(last_event_id), replay),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS,
+    )
+
+
+@app.get("/api/live/posts")
+async def stream_new_posts(
+    category_id: int = -1,
+    last_event_id: Optional[str] = Header(None),
+):
+    """SSE stream of new posts ("post" events carrying a PostSummaryResponse)"""
+
+    async def replay(after_post_id: int, limit: int):
+        # Its own short-lived session: the stream must not pin a connection
+        query = (
+            select(
+                Post.post_id,
+                Post.title,
+                Post.category_id,
+                Post.user_id,
+                User.nickname,
+                Post.view_count,
+                Post.comment_count,
+                Post.like_count,
+                Post.created_at,
+            )
+            .join(User, User.user_id == Post.user_id)
+            .where(Post.post_id > after_post_id)
+        )
+        if category_id != -1:
+            query = query.where(Post.category_id == category_id)
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(query.order_by(Post.post_id).limit(limit))
+            return [
+                (
+                    row.post_id,
+                    "post",
+                    PostSummaryResponse.model_validate(row).model_dump(mode="json"),
+                )
+                for row in rows
+            ]
+
+    return live_response(f"posts:{category_id}", last_event_id, replay)
+
+
+@app.get("/api/live/posts/{post_id}/comments")
+async def stream_new_comments(
+    post_id: int,
+    last_event_id: Optional[str] = Header(None),
+):
+    """SSE stream of a post's new comments ("comment" events)"""
+
+    async def replay(after_comment_id: int, limit: int):
+        async with AsyncSessionLocal() as db:
+            comments = await db.scalars(
+                select(Comment)
+                .options(*COMMENT_OPTIONS)
+                .where(
+                    Comment.post_id == post_id,
+                    Comment.comment_id > after_comment_id,
+                )
+                .order_by(Comment.comment_id)
+                .limit(limit)
+            )
+            return [
+                (
+                    comment.comment_id,
+                    "comment",
+                    CommentResponse.model_validate(comment).model_dump(mode="json"),
+                )
+                for comment in comments
+            ]
+
+    return live_response(f"comments:{post_id}", last_event_id, replay)
+
+
 # --- Category CRUD ---
 @app.get("/api/categories", response_model=list[CategoryResponse])
-async def get_categories(db: Session = Depends(get_db)):
-    try:
-        categories = []
-        for status in CategoryStatus:
-            category = (
-                db.query(Category).filter(Category.category_status == status).first()
-            )
-            if not category:
-                # Create category if it doesn't exist
-                category = Category(category_status=status)
-                db.add(category)
-                db.commit()
-                db.refresh(category)
-            categories.append(category)
-        return categories
-    except Exception as e:
-        print(f"Error in get_categories: {str(e)}")  # 디버깅을 위한 로그
-        raise HTTPException(status_code=500, detail=str(e))
+def get_categories():
+    return category_registry.all()
 
 
 @app.get("/api/categories/{category_id}", response_model=CategoryResponse)
-def get_category(category_id: int, db: Session = Depends(get_db)):
-    category = db.query(Category).filter(Category.category_id == category_id).first()
+def get_category(category_id: int):
+    category = category_registry.get(category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     return category
@@ -476,7 +1281,11 @@ def get_category(category_id: int, db: Session = Depends(get_db)):
 def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
     db_category = Category(**category.model_dump())
     db.add(db_category)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Category already exists")
+    category_registry.load(db)
     db.refresh(db_category)
     return db_category
 
@@ -491,7 +1300,11 @@ def update_category(
     update_data = category.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_category, key, value)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Category already exists")
+    category_registry.load(db)
     db.refresh(db_category)
     return db_category
 
@@ -503,4 +1316,73 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Category not found")
     db.delete(category)
     db.commit()
+    category_registry.load(db)
+    response_cache.invalidate("posts")
     return {"detail": "Category deleted"}
+
+
+# --- EXPORT ---
+@app.get("/api/export/posts")
+async def export_posts(
+    since: Optional[datetime] = Query(None, description="Only posts updated after"),
+    after_post_id: int = Query(0, description="Tie-breaker for posts at `since`"),
+    category_id: int = -1,
+    include_comments: bool = False,
+    admin: Principal = Depends(get_current_admin_user),
+):
+    return StreamingResponse(
+        stream_posts(since, after_post_id, category_id, include_comments),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+# --- ADMIN ---
+@app.post("/api/admin/counters/reconcile")
+def reconcile_post_counters(
+    db: Session = Depends(get_db),
+    admin: Principal = Depends(get_current_admin_user),
+):
+    return {"posts": reconcile_counters(db)}
+
+
+@app.post("/api/admin/posts:batchDelete", response_model=PostBatchResponse)
+def batch_delete(
+    batch: PostBatchDelete,
+    db: Session = Depends(get_db),
+    admin: Principal = Depends(get_current_admin_user),
+):
+    return PostBatchResponse(post_ids=batch_delete_posts(db, batch.post_ids))
+
+
+@app.post("/api/admin/posts:batchMove", response_model=PostBatchResponse)
+def batch_move(
+    batch: PostBatchMove,
+    db: Session = Depends(get_db),
+    admin: Principal = Depends(get_current_admin_user),
+):
+    if batch.category_id not in category_registry:
+        raise HTTPException(status_code=400, detail="Category not found")
+    return PostBatchResponse(
+        post_ids=batch_move_posts(db, batch.post_ids, batch.category_id)
+    )
+
+
+# --- INTERNAL ---
+# Operational endpoints; keep them off the public ingress
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/internal/metrics/db", include_in_schema=False)
+def get_db_pool_metrics():
+    return {
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.sync_engine.pool),
+        "replicas": [
+            dict(pool_status(replica.engine.pool), healthy=replica.healthy)
+            for replica in replica_router.replicas
+        ],
+    }
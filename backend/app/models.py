@@ -1,6 +1,16 @@
 from enum import Enum
 from datetime import datetime
-from sqlalchemy import VARCHAR, Boolean, Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import (
+    VARCHAR,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    JSON,
+    Index,
+    Integer,
+    Text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy import Enum as SQLEnum
 from app.database import Base
@@ -27,7 +37,7 @@ class User(Base):
     user_id = Column(Integer, primary_key=True, index=True)
     social_id = Column(VARCHAR(255), nullable=False, unique=True, index=True)
     nickname = Column(VARCHAR(255), nullable=False)
-    profile_image = Column(VARCHAR, nullable=True)
+    profile_image = Column(VARCHAR(255), nullable=True)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
     updated_at = Column(
         DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
@@ -48,7 +58,7 @@ class Category(Base):
     __tablename__ = "categories"
 
     category_id = Column(Integer, primary_key=True, index=True)
-    category_status = Column(SQLEnum(CategoryStatus), nullable=False)
+    category_status = Column(SQLEnum(CategoryStatus), nullable=False, unique=True)
 
     # Relationships
     posts = relationship(
@@ -58,6 +68,28 @@ class Category(Base):
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Full-text search over title/content (ngram parser for Korean).
+        # MySQL only; other dialects use the in-process index in app/search.py.
+        Index(
+            "ix_posts_title_content_fulltext",
+            "title",
+            "content",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql"),
+        # Feed: WHERE category_id = ? ORDER BY created_at DESC, post_id DESC
+        Index(
+            "ix_posts_category_id_created_at", "category_id", "created_at", "post_id"
+        ),
+        # Feed without a category filter, and the popular sorts
+        Index("ix_posts_created_at", "created_at", "post_id"),
+        Index("ix_posts_like_count", "like_count", "post_id"),
+        Index("ix_posts_comment_count", "comment_count", "post_id"),
+        Index("ix_posts_user_id", "user_id"),
+        # Incremental export: WHERE updated_at > ? ORDER BY updated_at, post_id
+        Index("ix_posts_updated_at", "updated_at", "post_id"),
+    )
 
     post_id = Column(Integer, primary_key=True, index=True)
     title = Column(VARCHAR(255), nullable=False)
@@ -67,6 +99,9 @@ class Post(Base):
         DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
     )
     view_count = Column(Integer, default=0, nullable=False)
+    # Denormalized counters, kept in step by app/counters.py
+    like_count = Column(Integer, default=0, nullable=False)
+    comment_count = Column(Integer, default=0, nullable=False)
 
     # Foreign Keys
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
@@ -75,13 +110,27 @@ class Post(Base):
     # Relationships
     user = relationship("User", back_populates="posts")
     category = relationship("Category", back_populates="posts")
+    # Children are removed by ON DELETE CASCADE, not loaded and deleted one
+    # by one (passive_deletes)
     post_images = relationship(
-        "PostImage", back_populates="post", cascade="all, delete-orphan"
+        "PostImage",
+        back_populates="post",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="PostImage.post_image_id",
     )
     comments = relationship(
-        "Comment", back_populates="post", cascade="all, delete-orphan"
+        "Comment",
+        back_populates="post",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    likes = relationship(
+        "Like",
+        back_populates="post",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
-    likes = relationship("Like", back_populates="post", cascade="all, delete-orphan")
 
     def increase_view_count(self):
         """Increase view count by 1"""
@@ -97,6 +146,17 @@ class Post(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # A post's comments in creation order
+        Index("ix_comments_post_id_created_at", "post_id", "created_at"),
+        # Threads: WHERE post_id = ? AND parent_id IS NULL ORDER BY comment_id
+        Index("ix_comments_post_id_parent_id", "post_id", "parent_id", "comment_id"),
+        # Subtrees: WHERE post_id = ? AND path > ? AND path < ? ORDER BY path
+        Index("ix_comments_post_id_path", "post_id", "path"),
+        Index("ix_comments_user_id", "user_id"),
+        # ON DELETE CASCADE looks children up by parent_id alone
+        Index("ix_comments_parent_id", "parent_id"),
+    )
 
     comment_id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -105,9 +165,20 @@ class Comment(Base):
         DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
     )
 
+    # Threading (see app/comment_tree.py): materialized path of zero-padded
+    # ids from the thread root down to this comment, e.g. "0000000012/0000000345/"
+    path = Column(VARCHAR(255), nullable=False, default="")
+    depth = Column(Integer, default=0, nullable=False)
+    reply_count = Column(Integer, default=0, nullable=False)  # direct replies
+
     # Foreign Keys
-    post_id = Column(Integer, ForeignKey("posts.post_id"), nullable=False)
+    post_id = Column(
+        Integer, ForeignKey("posts.post_id", ondelete="CASCADE"), nullable=False
+    )
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    parent_id = Column(
+        Integer, ForeignKey("comments.comment_id", ondelete="CASCADE"), nullable=True
+    )
 
     # Relationships
     post = relationship("Post", back_populates="comments")
@@ -121,13 +192,29 @@ class Comment(Base):
 
 class PostImage(Base):
     __tablename__ = "post_images"
+    __table_args__ = (
+        # A post's images, and the lookup behind ON DELETE CASCADE
+        Index("ix_post_images_post_id", "post_id"),
+    )
 
     post_image_id = Column(Integer, primary_key=True, index=True)
     image_url = Column(Text, nullable=True)
     original_filename = Column(VARCHAR(255), nullable=True)
+    # Upload pipeline (app/images.py): the original is stored once per content
+    # hash, and `variants` maps size name -> {width, height, jpeg|png, webp}
+    storage_key = Column(VARCHAR(255), nullable=True)
+    content_hash = Column(VARCHAR(64), nullable=True, index=True)
+    byte_size = Column(Integer, nullable=True)
+    status = Column(VARCHAR(16), nullable=False, default="ready")
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    variants = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
 
     # Foreign Keys
-    post_id = Column(Integer, ForeignKey("posts.post_id"), nullable=False)
+    post_id = Column(
+        Integer, ForeignKey("posts.post_id", ondelete="CASCADE"), nullable=False
+    )
 
     # Relationships
     post = relationship("Post", back_populates="post_images")
@@ -135,10 +222,16 @@ class PostImage(Base):
 
 class Like(Base):
     __tablename__ = "likes"
+    __table_args__ = (
+        # The primary key leads with user_id; lookups by post need their own index
+        Index("ix_likes_post_id_user_id", "post_id", "user_id"),
+    )
 
     # Composite primary key
     user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)
-    post_id = Column(Integer, ForeignKey("posts.post_id"), primary_key=True)
+    post_id = Column(
+        Integer, ForeignKey("posts.post_id", ondelete="CASCADE"), primary_key=True
+    )
 
     is_liked = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
@@ -146,3 +239,66 @@ class Like(Base):
     # Relationships
     user = relationship("User", back_populates="likes")
     post = relationship("Post", back_populates="likes")
+
+
+class AccountDeletionJob(Base):
+    """Progress of a background account deletion (app/account_deletion.py)"""
+
+    __tablename__ = "account_deletion_jobs"
+    __table_args__ = (Index("ix_account_deletion_jobs_status", "status", "job_id"),)
+
+    job_id = Column(Integer, primary_key=True, index=True)
+    # No foreign key: the user row is the last thing the job deletes
+    user_id = Column(Integer, nullable=False, index=True)
+    status = Column(VARCHAR(16), nullable=False, default="pending")
+    phase = Column(VARCHAR(16), nullable=False, default="posts")
+    posts_deleted = Column(Integer, default=0, nullable=False)
+    comments_deleted = Column(Integer, default=0, nullable=False)
+    likes_deleted = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    # Lease held by the worker running the job; an expired lease means the
+    # worker died and another one may resume the job
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
+    )
+    finished_at = Column(DateTime, nullable=True)
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # A user's feed: WHERE user_id = ? AND notification_id < ? ORDER BY id DESC
+        Index("ix_notifications_user_id_notification_id", "user_id", "notification_id"),
+        # Unread count: WHERE user_id = ? AND is_read = false
+        Index("ix_notifications_user_id_is_read", "user_id", "is_read"),
+        # Lookups behind the ON DELETE CASCADEs
+        Index("ix_notifications_actor_id", "actor_id"),
+        Index("ix_notifications_post_id", "post_id"),
+        Index("ix_notifications_comment_id", "comment_id"),
+    )
+
+    notification_id = Column(Integer, primary_key=True, index=True)
+    # comment (on your post), reply (to your comment), thread (a post you
+    # commented on), like (your post)
+    kind = Column(VARCHAR(16), nullable=False)
+    is_read = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    # Foreign Keys (rows go away with the user, post or comment they are about)
+    user_id = Column(
+        Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False
+    )
+    actor_id = Column(
+        Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False
+    )
+    post_id = Column(
+        Integer, ForeignKey("posts.post_id", ondelete="CASCADE"), nullable=False
+    )
+    comment_id = Column(
+        Integer, ForeignKey("comments.comment_id", ondelete="CASCADE"), nullable=True
+    )
+
+    # Relationships
+    actor = relationship("User", foreign_keys=[actor_id])
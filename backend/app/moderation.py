@@ -0,0 +1,91 @@
+"""Set-based bulk moderation of posts.
+
+A spam wave is cleaned up with one `DELETE ... WHERE post_id IN (...)` per
+chunk instead of loading every post and its children into the session:
+comments, likes and images go with their post through the foreign keys'
+ON DELETE CASCADE. Each chunk is committed separately, so a large batch
+never holds locks on thousands of rows at once and an interrupted batch can
+simply be resent.
+"""
+
+from typing import Iterator, List
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.cache import response_cache
+from app.models import Post
+from app.popular import popular_ranking
+from app.search import get_search_backend
+
+BATCH_CHUNK_SIZE = 500
+
+
+def _existing_chunks(
+    db: Session, post_ids: List[int], chunk_size: int
+) -> Iterator[List[int]]:
+    """The ids that exist, in ascending chunks of at most `chunk_size`"""
+    unique = sorted(set(post_ids))
+    for start in range(0, len(unique), chunk_size):
+        found = db.scalars(
+            select(Post.post_id)
+            .where(Post.post_id.in_(unique[start : start + chunk_size]))
+            .order_by(Post.post_id)
+        ).all()
+        if found:
+            yield list(found)
+
+
+def batch_delete_posts(
+    db: Session, post_ids: List[int], chunk_size: int = BATCH_CHUNK_SIZE
+) -> List[int]:
+    """Delete posts with their comments, likes and images; returns deleted ids"""
+    search = get_search_backend(db)
+    deleted = []
+    for chunk in _existing_chunks(db, post_ids, chunk_size):
+        db.execute(
+            delete(Post)
+            .where(Post.post_id.in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        for post_id in chunk:
+            search.remove_post(post_id)
+            popular_ranking.remove_post(post_id)
+        response_cache.invalidate(
+            *(f"post:{post_id}" for post_id in chunk),
+            *(f"comments:{post_id}" for post_id in chunk),
+        )
+        deleted.extend(chunk)
+    if deleted:
+        response_cache.invalidate("posts")
+    return deleted
+
+
+def batch_move_posts(
+    db: Session,
+    post_ids: List[int],
+    category_id: int,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> List[int]:
+    """Move posts to another category; returns the ids moved"""
+    search = get_search_backend(db)
+    moved = []
+    for chunk in _existing_chunks(db, post_ids, chunk_size):
+        # A Core UPDATE still applies Post.updated_at's onupdate, so
+        # incremental exports pick the moved posts up
+        db.execute(
+            update(Post)
+            .where(Post.post_id.in_(chunk))
+            .values(category_id=category_id)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        for post_id in chunk:
+            search.move_post(post_id, category_id)
+            popular_ranking.move_post(post_id, category_id)
+        response_cache.invalidate(*(f"post:{post_id}" for post_id in chunk))
+        moved.extend(chunk)
+    if moved:
+        response_cache.invalidate("posts")
+    return moved
@@ -0,0 +1,257 @@
+"""Notification fan-out, off the request path.
+
+Comment and like handlers only `publish()` a small event onto a bounded
+in-process asyncio queue. A consumer task started from the app lifespan
+drains the queue in batches, works out who to notify (the post's author,
+the author of the comment replied to, and everyone else who commented on the
+post) and writes all rows of a batch as bulk (executemany) INSERTs of up to
+NOTIFICATION_INSERT_CHUNK rows, so a comment on a post with thousands of
+participants costs the writer nothing extra.
+
+Events are not persisted: those still queued when the process dies are
+lost, and when the queue is full new events are dropped rather than slowing
+writers down. Unread counts are cached per user (shared through Redis when
+REDIS_URL is set, its calls run in the threadpool) and recomputed from the
+table on a miss.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, insert, select
+
+from app.database import async_engine
+from app.kvstore import get_shared_client
+from app.models import Comment, Notification, Post
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_QUEUE_SIZE = int(os.getenv("NOTIFICATION_QUEUE_SIZE", "10000"))
+NOTIFICATION_BATCH_SIZE = 200  # events per consumer batch
+NOTIFICATION_INSERT_CHUNK = 1000  # rows per INSERT statement
+NOTIFICATION_UNREAD_TTL = int(os.getenv("NOTIFICATION_UNREAD_TTL", "300"))
+
+notifications_table = Notification.__table__
+
+
+@dataclass(frozen=True)
+class NotificationEvent:
+    kind: str  # "comment" or "like"
+    actor_id: int
+    post_id: int
+    comment_id: Optional[int] = None
+    parent_id: Optional[int] = None
+
+
+class InMemoryUnreadStore:
+    """Per-process unread counts with a TTL"""
+
+    blocking = False
+
+    def __init__(self, ttl: float = NOTIFICATION_UNREAD_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._counts: Dict[int, tuple] = {}
+
+    def get(self, user_id: int) -> Optional[int]:
+        with self._lock:
+            entry = self._counts.get(user_id)
+            if entry is None or entry[1] <= time.monotonic():
+                self._counts.pop(user_id, None)
+                return None
+            return entry[0]
+
+    def set(self, user_id: int, count: int):
+        with self._lock:
+            self._counts[user_id] = (count, time.monotonic() + self.ttl)
+
+    def add(self, counts: Dict[int, int]):
+        """Increment counts that are cached; missing ones are computed on read"""
+        now = time.monotonic()
+        with self._lock:
+            for user_id, n in counts.items():
+                entry = self._counts.get(user_id)
+                if entry is not None and entry[1] > now:
+                    self._counts[user_id] = (entry[0] + n, entry[1])
+
+
+class RedisUnreadStore:
+    """Unread counts shared by all workers through a redis client"""
+
+    blocking = True  # every call is a redis round trip
+
+    def __init__(self, client, ttl: float = NOTIFICATION_UNREAD_TTL):
+        self._client = client
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"notifications:unread:{user_id}"
+
+    def get(self, user_id: int) -> Optional[int]:
+        value = self._client.get(self._key(user_id))
+        return int(value) if value is not None else None
+
+    def set(self, user_id: int, count: int):
+        self._client.set(self._key(user_id), count, ex=self.ttl)
+
+    def add(self, counts: Dict[int, int]):
+        pipe = self._client.pipeline(transaction=False)
+        for user_id, n in counts.items():
+            pipe.incrby(self._key(user_id), n)
+        results = pipe.execute()
+        # INCRBY creates missing keys; a result equal to the increment means
+        # the count wasn't cached, so drop it and let the next read recount
+        missing = [
+            self._key(user_id)
+            for (user_id, n), value in zip(counts.items(), results)
+            if int(value) == n
+        ]
+        if missing:
+            self._client.delete(*missing)
+
+
+class NotificationService:
+    def __init__(self, unread, queue_size: int = NOTIFICATION_QUEUE_SIZE):
+        self.unread = unread
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._delivering: Optional[asyncio.Future] = None
+        self.dropped = 0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        return self._queue
+
+    def publish(self, event: NotificationEvent):
+        """Queue an event without waiting (call from the event loop)"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Notification queue full; dropped %s", event)
+
+    async def _recipients(self, conn, event: NotificationEvent) -> Dict[int, str]:
+        """recipient user_id -> kind, most specific kind first"""
+        author_id = await conn.scalar(
+            select(Post.user_id).where(Post.post_id == event.post_id)
+        )
+        if author_id is None:
+            return {}
+        if event.kind == "like":
+            recipients = {author_id: "like"}
+        else:
+            exists = await conn.scalar(
+                select(Comment.comment_id).where(Comment.comment_id == event.comment_id)
+            )
+            if exists is None:
+                return {}  # deleted before delivery
+            participants = await conn.scalars(
+                select(Comment.user_id)
+                .where(Comment.post_id == event.post_id)
+                .distinct()
+            )
+            recipients = {user_id: "thread" for user_id in participants}
+            recipients[author_id] = "comment"
+            if event.parent_id is not None:
+                parent_author = await conn.scalar(
+                    select(Comment.user_id).where(
+                        Comment.comment_id == event.parent_id
+                    )
+                )
+                if parent_author is not None:
+                    recipients[parent_author] = "reply"
+        recipients.pop(event.actor_id, None)
+        return recipients
+
+    async def deliver(self, events: Iterable[NotificationEvent]) -> int:
+        """Write the notifications for `events`; returns the rows inserted"""
+        rows: List[dict] = []
+        async with async_engine.begin() as conn:
+            for event in events:
+                for user_id, kind in (await self._recipients(conn, event)).items():
+                    rows.append(
+                        {
+                            "user_id": user_id,
+                            "actor_id": event.actor_id,
+                            "post_id": event.post_id,
+                            "comment_id": event.comment_id,
+                            "kind": kind,
+                        }
+                    )
+            for start in range(0, len(rows), NOTIFICATION_INSERT_CHUNK):
+                await conn.execute(
+                    insert(notifications_table),
+                    rows[start : start + NOTIFICATION_INSERT_CHUNK],
+                )
+        counts: Dict[int, int] = {}
+        for row in rows:
+            counts[row["user_id"]] = counts.get(row["user_id"], 0) + 1
+        await self._unread_call(self.unread.add, counts)
+        return len(rows)
+
+    def _take_batch(self, first: NotificationEvent) -> List[NotificationEvent]:
+        batch = [first]
+        while len(batch) < NOTIFICATION_BATCH_SIZE:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _deliver_batch(self, batch: List[NotificationEvent]):
+        try:
+            await self.deliver(batch)
+        except Exception:
+            logger.exception("Failed to deliver %d notification events", len(batch))
+
+    async def run(self):
+        while True:
+            batch = self._take_batch(await self.queue.get())
+            # Shielded: cancelling the consumer on shutdown must not abandon a
+            # batch halfway through its transaction (flush() waits for it)
+            self._delivering = asyncio.ensure_future(self._deliver_batch(batch))
+            await asyncio.shield(self._delivering)
+
+    async def flush(self) -> int:
+        """Deliver whatever is still queued (called on shutdown)"""
+        if self._delivering is not None:
+            await self._delivering
+        delivered = 0
+        while not self.queue.empty():
+            delivered += await self.deliver(self._take_batch(self.queue.get_nowait()))
+        return delivered
+
+    async def _unread_call(self, method, *args):
+        """Call an unread store method without blocking the event loop"""
+        if self.unread.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    async def unread_count(self, db, user_id: int, refresh: bool = False) -> int:
+        count = None if refresh else await self._unread_call(self.unread.get, user_id)
+        if count is None:
+            count = await db.scalar(
+                select(func.count())
+                .select_from(Notification)
+                .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+            )
+            await self._unread_call(self.unread.set, user_id, count)
+        return count
+
+
+def create_notification_service() -> NotificationService:
+    client = get_shared_client()
+    unread = RedisUnreadStore(client) if client is not None else InMemoryUnreadStore()
+    return NotificationService(unread)
+
+
+notifications = create_notification_service()
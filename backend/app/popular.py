@@ -0,0 +1,187 @@
+"""In-memory "popular posts" ranking, updated incrementally.
+
+A post's score is its weighted engagement decayed by age:
+
+    score = (1 + views * w_view + likes * w_like + comments * w_comment)
+            / 2 ** (age_hours / POPULAR_HALF_LIFE_HOURS)
+
+Every post decays at the same rate, so the order never changes just because
+time passes. Each post is therefore ranked by the time-independent log-space
+key `log2(engagement) + created_hours / half_life`. A view, like or comment
+only re-sorts that one post, in O(log n) plus a list insert.
+
+Rankings are kept per (category, window), with category -1 meaning all
+categories, so `top()` is O(limit). A lifespan task runs on a schedule:
+- it drops posts that have aged out of their windows;
+- it rebuilds the ranking from the database counters, which also folds in
+  events handled by other workers.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Post
+
+logger = logging.getLogger(__name__)
+
+POPULAR_HALF_LIFE_HOURS = float(os.getenv("POPULAR_HALF_LIFE_HOURS", "12"))
+POPULAR_REFRESH_INTERVAL = float(os.getenv("POPULAR_REFRESH_INTERVAL", "300"))
+
+WINDOWS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+WEIGHTS = {"view": 1.0, "like": 3.0, "comment": 5.0}
+ALL_CATEGORIES = -1
+
+
+@dataclass
+class _Entry:
+    category_id: int
+    created_at: datetime
+    engagement: float
+
+    def key(self, half_life_hours: float) -> float:
+        created_hours = self.created_at.timestamp() / 3600
+        return math.log2(self.engagement) + created_hours / half_life_hours
+
+
+class PopularRanking:
+    def __init__(self, half_life_hours: float = POPULAR_HALF_LIFE_HOURS):
+        self.half_life_hours = half_life_hours
+        self._lock = threading.Lock()
+        self._entries: Dict[int, _Entry] = {}
+        # (category_id, window) -> [(-key, post_id)], best first
+        self._rankings: Dict[Tuple[int, str], List[Tuple[float, int]]] = {}
+
+    def _slots(self, entry: _Entry, now: datetime):
+        for window, span in WINDOWS.items():
+            if entry.created_at >= now - span:
+                yield (ALL_CATEGORIES, window)
+                yield (entry.category_id, window)
+
+    def _insert(self, post_id: int, entry: _Entry, now: datetime):
+        item = (-entry.key(self.half_life_hours), post_id)
+        for slot in self._slots(entry, now):
+            insort(self._rankings.setdefault(slot, []), item)
+
+    def _discard(self, post_id: int, entry: _Entry):
+        item = (-entry.key(self.half_life_hours), post_id)
+        for window in WINDOWS:
+            for slot in ((ALL_CATEGORIES, window), (entry.category_id, window)):
+                ranking = self._rankings.get(slot)
+                if not ranking:
+                    continue
+                index = bisect_left(ranking, item)
+                if index < len(ranking) and ranking[index] == item:
+                    del ranking[index]
+
+    def add_post(self, post_id: int, category_id: int, created_at: datetime):
+        with self._lock:
+            if post_id in self._entries:
+                return
+            entry = _Entry(category_id, created_at, 1.0)
+            self._entries[post_id] = entry
+            self._insert(post_id, entry, datetime.now())
+
+    def record(self, post_id: int, event: str, n: int = 1):
+        """Apply `n` (negative to undo) views, likes or comments to a post"""
+        with self._lock:
+            entry = self._entries.get(post_id)
+            if entry is None:  # older than every window, or not loaded yet
+                return
+            self._discard(post_id, entry)
+            entry.engagement = max(1.0, entry.engagement + WEIGHTS[event] * n)
+            self._insert(post_id, entry, datetime.now())
+
+    def move_post(self, post_id: int, category_id: int):
+        with self._lock:
+            entry = self._entries.get(post_id)
+            if entry is None or entry.category_id == category_id:
+                return
+            self._discard(post_id, entry)
+            entry.category_id = category_id
+            self._insert(post_id, entry, datetime.now())
+
+    def remove_post(self, post_id: int):
+        with self._lock:
+            entry = self._entries.pop(post_id, None)
+            if entry is not None:
+                self._discard(post_id, entry)
+
+    def top(self, category_id: int, window: str, limit: int) -> List[int]:
+        cutoff = datetime.now() - WINDOWS[window]
+        post_ids = []
+        with self._lock:
+            for _, post_id in self._rankings.get((category_id, window), ()):
+                # Entries that aged out since the last prune are skipped
+                if self._entries[post_id].created_at >= cutoff:
+                    post_ids.append(post_id)
+                    if len(post_ids) == limit:
+                        break
+        return post_ids
+
+    def rebuild(self, db: Session):
+        """Replace the ranking with one computed from the posts table"""
+        now = datetime.now()
+        rows = db.execute(
+            select(
+                Post.post_id,
+                Post.category_id,
+                Post.created_at,
+                Post.view_count,
+                Post.like_count,
+                Post.comment_count,
+            ).where(Post.created_at >= now - max(WINDOWS.values()))
+        )
+        entries = {
+            row.post_id: _Entry(
+                row.category_id,
+                row.created_at,
+                1.0
+                + row.view_count * WEIGHTS["view"]
+                + row.like_count * WEIGHTS["like"]
+                + row.comment_count * WEIGHTS["comment"],
+            )
+            for row in rows
+        }
+        rankings: Dict[Tuple[int, str], List[Tuple[float, int]]] = {}
+        for post_id, entry in entries.items():
+            item = (-entry.key(self.half_life_hours), post_id)
+            for slot in self._slots(entry, now):
+                rankings.setdefault(slot, []).append(item)
+        for ranking in rankings.values():
+            ranking.sort()
+        with self._lock:
+            self._entries, self._rankings = entries, rankings
+
+    def _rebuild(self):
+        with SessionLocal() as db:
+            self.rebuild(db)
+
+    async def startup(self):
+        await run_in_threadpool(self._rebuild)
+
+    async def run(self, interval: float = POPULAR_REFRESH_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self._rebuild)
+            except Exception:
+                logger.exception("Failed to rebuild the popular posts ranking")
+
+
+popular_ranking = PopularRanking()
@@ -0,0 +1,209 @@
+"""Per-route rate limits keyed on the caller (user id from the token, or IP).
+
+`rate_limit(route, key_func)` builds a dependency meant for a route's
+`dependencies=[...]`, which FastAPI resolves before the endpoint's own
+parameters. A rejected request therefore never opens a session or borrows a
+pooled connection. Allowed responses carry X-RateLimit-Limit/-Remaining/
+-Reset; rejected ones get 429 with Retry-After as well.
+
+Backends:
+
+- `TokenBucketStore` (default): one token bucket per key in process memory,
+  refilled continuously at limit/window per second. A check is O(1), and the
+  least recently used buckets are evicted beyond RATE_LIMIT_MAX_KEYS.
+- `SlidingWindowStore` (REDIS_URL set): limits shared by all workers with a
+  sliding-window counter, i.e. the current fixed window's count plus the
+  previous one's weighted by how much of it still overlaps the window. Two
+  keys per caller and one pipelined round trip per check.
+
+Anonymous callers are keyed by `client_ip()`. Behind a reverse proxy the
+connection comes from the proxy, so list the proxies in TRUSTED_PROXIES and
+the client is taken from their X-Forwarded-For; otherwise every anonymous
+caller would share the proxy's limit. (Running uvicorn with --proxy-headers
+--forwarded-allow-ips=<proxies> has the same effect.)
+"""
+
+import ipaddress
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.kvstore import get_shared_client
+from app.metrics import Counter, registry
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") != "0"
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Reverse proxies (addresses or CIDRs, comma-separated) whose
+# X-Forwarded-For is believed
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(value.strip(), strict=False)
+    for value in os.getenv("TRUSTED_PROXIES", "").split(",")
+    if value.strip()
+]
+
+# route -> (requests, window in seconds) per caller
+RATE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "create_post": (int(os.getenv("RATE_LIMIT_CREATE_POST", "10")), 60),
+    "create_comment": (int(os.getenv("RATE_LIMIT_CREATE_COMMENT", "30")), 60),
+    "upload_image": (int(os.getenv("RATE_LIMIT_UPLOAD_IMAGE", "20")), 60),
+    "kakao_login": (int(os.getenv("RATE_LIMIT_KAKAO_LOGIN", "20")), 60),
+}
+
+rate_limited_total = registry.register(
+    Counter("rate_limited_total", "Requests rejected by rate limits", ("route",))
+)
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the caller is back to a full allowance
+    retry_after: float = 0.0  # seconds until the next request may pass
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class TokenBucketStore:
+    """Per-process token buckets with LRU eviction"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def hit(self, key: str, limit: int, window: float) -> Decision:
+        rate = limit / window  # tokens per second
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (limit, now))
+            tokens = min(limit, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return Decision(
+            allowed=allowed,
+            limit=limit,
+            remaining=int(tokens),
+            reset_after=(limit - tokens) / rate,
+            retry_after=0.0 if allowed else (1 - tokens) / rate,
+        )
+
+
+class SlidingWindowStore:
+    """Sliding-window counters shared through a redis client"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def hit(self, key: str, limit: int, window: float) -> Decision:
+        now = time.time()
+        current = int(now // window)
+        elapsed = now - current * window
+        current_key = f"ratelimit:{key}:{current}"
+        pipe = self._client.pipeline(transaction=True)
+        pipe.get(f"ratelimit:{key}:{current - 1}")
+        pipe.incrby(current_key, 1)
+        pipe.expire(current_key, int(window * 2) + 1)
+        previous, count, _ = pipe.execute()
+        weight = 1 - elapsed / window
+        estimate = int(previous or 0) * weight + count
+        if estimate <= limit:
+            return Decision(
+                allowed=True,
+                limit=limit,
+                remaining=int(limit - estimate),
+                reset_after=2 * window - elapsed,
+            )
+        # Rejected requests don't count, so a flood doesn't extend its own ban
+        self._client.incrby(current_key, -1)
+        count -= 1
+        if count >= limit:
+            retry_after = window - elapsed
+        else:
+            # When the previous window's share has decayed enough
+            retry_after = (
+                window * (1 - (limit - count - 1) / int(previous)) - elapsed
+            )
+        return Decision(
+            allowed=False,
+            limit=limit,
+            remaining=0,
+            reset_after=2 * window - elapsed,
+            retry_after=max(retry_after, 0.0),
+        )
+
+
+def _trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(request: Request) -> str:
+    """The caller's address, looking through X-Forwarded-For of trusted proxies
+
+    Hops are read from the right and the first one that isn't a trusted proxy
+    is the client, so whatever a client puts in the header itself is ignored.
+    """
+    host = request.client.host if request.client else "unknown"
+    if not _trusted_proxy(host):
+        return host
+    forwarded = ",".join(request.headers.getlist("x-forwarded-for"))
+    for hop in reversed(forwarded.split(",")):
+        hop = hop.strip()
+        if not hop:
+            continue
+        host = hop
+        if not _trusted_proxy(hop):
+            break
+    return host
+
+
+def create_rate_limit_store():
+    client = get_shared_client()
+    return SlidingWindowStore(client) if client is not None else TokenBucketStore()
+
+
+rate_limit_store = create_rate_limit_store()
+
+
+def rate_limit(route: str, key_func: Callable[..., str]):
+    """Dependency enforcing RATE_LIMITS[route] per `key_func` caller key"""
+    limit, window = RATE_LIMITS[route]
+
+    def check(response: Response, key: str = Depends(key_func)):
+        if not RATE_LIMIT_ENABLED:
+            return
+        decision = rate_limit_store.hit(f"{route}:{key}", limit, window)
+        if not decision.allowed:
+            rate_limited_total.inc(route)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers=decision.headers(),
+            )
+        response.headers.update(decision.headers())
+
+    return check
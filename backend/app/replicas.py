@@ -0,0 +1,238 @@
+"""Primary/replica routing for read-only endpoints.
+
+Replicas are listed in REPLICA_DATABASE_URLS (comma-separated DSNs, one
+engine each in app.database). GET handlers that only read depend on
+`get_read_db` instead of `get_db`. It hands out a session bound to a healthy
+replica, picked round robin, or to the primary when there are no replicas
+or none is healthy. Writes keep using `get_db` and always go to the primary.
+
+Health: a lifespan task pings every replica each REPLICA_HEALTH_INTERVAL
+seconds. On MySQL it also reads Seconds_Behind_Source (the replica user
+needs REPLICATION CLIENT); a replica lagging more than
+REPLICA_MAX_LAG_SECONDS, or whose replication has stopped, is skipped until
+it catches up. A connection error on a replica marks it down
+immediately. That request still fails, but the following ones go elsewhere
+until the next check passes.
+
+Read-your-writes: `StickyPrimaryMiddleware` marks callers (bearer token, or
+client IP when anonymous) after each successful write request, and their
+reads go to the primary for REPLICA_STICKY_SECONDS. A user who just created
+a post therefore reads it back even if the replicas have not replayed it
+yet. The marks are shared through Redis when REDIS_URL is set. The response
+cache (app.cache) does not store replica responses that may predate a recent
+write, so a stale one can't be served back to the writer from there either.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import SessionLocal, replica_engines
+from app.kvstore import get_shared_client
+from app.metrics import Counter, registry
+
+logger = logging.getLogger(__name__)
+
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+REPLICA_STICKY_MAX_KEYS = 100_000
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+db_read_sessions_total = registry.register(
+    Counter("db_read_sessions_total", "Read sessions by target", ("target",))
+)
+
+
+def caller_key(authorization: Optional[str], client_host: Optional[str]) -> str:
+    """Identify a caller without decoding its token (the same for every route)"""
+    if authorization:
+        return "token:" + hashlib.sha256(authorization.encode()).hexdigest()[:32]
+    return f"ip:{client_host or 'unknown'}"
+
+
+class InMemoryStickyStore:
+    """Per-process write marks with expiry, LRU-bounded"""
+
+    def __init__(self, max_keys: int = REPLICA_STICKY_MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._until: "OrderedDict[str, float]" = OrderedDict()
+
+    def mark(self, key: str, seconds: float):
+        with self._lock:
+            self._until[key] = time.monotonic() + seconds
+            self._until.move_to_end(key)
+            while len(self._until) > self.max_keys:
+                self._until.popitem(last=False)
+
+    def is_sticky(self, key: str) -> bool:
+        with self._lock:
+            until = self._until.get(key)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._until[key]
+                return False
+            return True
+
+
+class RedisStickyStore:
+    """Write marks shared by all workers through a redis client"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def mark(self, key: str, seconds: float):
+        self._client.set(f"primary:{key}", 1, ex=max(1, math.ceil(seconds)))
+
+    def is_sticky(self, key: str) -> bool:
+        return self._client.get(f"primary:{key}") is not None
+
+
+class Replica:
+    def __init__(self, engine):
+        self.engine = engine
+        self.name = engine.url.render_as_string(hide_password=True)
+        self.session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=engine, info={"replica": self.name}
+        )
+        self.healthy = False  # until the first check passes
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _handle_error(self, context):
+        if context.is_disconnect or context.connection is None:
+            self.mark_down("connection error")
+
+    def mark_down(self, reason: str):
+        if self.healthy:
+            logger.warning("Replica %s is down: %s", self.name, reason)
+        self.healthy = False
+
+    def check(self, max_lag: float = REPLICA_MAX_LAG_SECONDS):
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                lag = self._lag(conn)
+        except Exception as e:
+            self.mark_down(repr(e))
+            return
+        if lag is not None and lag > max_lag:
+            self.mark_down(f"{lag}s behind the primary")
+            return
+        if not self.healthy:
+            logger.info("Replica %s is up", self.name)
+        self.healthy = True
+
+    @staticmethod
+    def _lag(conn) -> Optional[float]:
+        """Seconds behind the primary; 0 when it can't be told (e.g. SQLite)"""
+        if conn.dialect.name != "mysql":
+            return 0
+        status = conn.exec_driver_sql("SHOW REPLICA STATUS").mappings().first()
+        if status is None:
+            return 0  # not a replica itself (e.g. behind a proxy)
+        lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+        return math.inf if lag is None else float(lag)  # None: replication stopped
+
+
+class ReplicaRouter:
+    def __init__(self, engines, sticky):
+        self.replicas: List[Replica] = [Replica(engine) for engine in engines]
+        self.sticky = sticky
+        self._turn = itertools.count()
+
+    def check(self):
+        for replica in self.replicas:
+            replica.check()
+
+    async def startup(self):
+        await run_in_threadpool(self.check)
+
+    async def run(self, interval: float = REPLICA_HEALTH_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self.check)
+            except Exception:
+                logger.exception("Failed to check replicas")
+
+    def mark_write(self, key: str):
+        if self.replicas:
+            self.sticky.mark(key, REPLICA_STICKY_SECONDS)
+
+    def session(self, key: Optional[str] = None):
+        """A read-only session on a healthy replica, else on the primary"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if healthy and not (key is not None and self.sticky.is_sticky(key)):
+            db_read_sessions_total.inc("replica")
+            return healthy[next(self._turn) % len(healthy)].session_factory()
+        db_read_sessions_total.inc("primary")
+        return SessionLocal()
+
+
+def create_replica_router() -> ReplicaRouter:
+    client = get_shared_client()
+    sticky = RedisStickyStore(client) if client is not None else InMemoryStickyStore()
+    return ReplicaRouter(replica_engines, sticky)
+
+
+replica_router = create_replica_router()
+
+
+def get_read_db(request: Request):
+    key = caller_key(
+        request.headers.get("authorization"),
+        request.client.host if request.client else None,
+    )
+    db = replica_router.session(key)
+    # Lets the response cache tell bodies that may lag behind the primary
+    request.state.read_replica = db.info.get("replica")
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class StickyPrimaryMiddleware:
+    """Pins a caller's reads to the primary for a while after each write"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in READ_METHODS
+            or not replica_router.replicas
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = dict(scope["headers"])
+                authorization = headers.get(b"authorization")
+                client = scope.get("client")
+                replica_router.mark_write(
+                    caller_key(
+                        authorization.decode("latin-1") if authorization else None,
+                        client[0] if client else None,
+                    )
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field, field_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from app.models import CategoryStatus
 
 
@@ -42,6 +42,21 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class AccountDeletionJobResponse(BaseModel):
+    job_id: int
+    user_id: int
+    status: str = Field(..., description="pending, running or done")
+    phase: str = Field(..., description="posts, comments, likes or user")
+    posts_deleted: int = 0
+    comments_deleted: int = 0
+    likes_deleted: int = 0
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class CategoryBase(BaseModel):
     category_status: CategoryStatus = Field(..., description="Category status")
 
@@ -71,7 +86,7 @@ class CommentBase(BaseModel):
 
 
 class CommentCreate(CommentBase):
-    pass
+    parent_id: Optional[int] = Field(None, description="Comment being replied to")
 
 
 class CommentUpdate(CommentBase):
@@ -83,6 +98,10 @@ class CommentResponse(CommentBase):
     post_id: int
     user_id: int
     user: UserResponse
+    parent_id: Optional[int] = None
+    path: str = ""
+    depth: int = 0
+    reply_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -90,6 +109,13 @@ class CommentResponse(CommentBase):
         from_attributes = True
 
 
+class CommentPageResponse(BaseModel):
+    items: List[CommentResponse] = []
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page (null on the last page)"
+    )
+
+
 class PostBase(BaseModel):
     title: str = Field(..., description="Post title")
     content: str = Field(..., description="Post content")
@@ -106,6 +132,20 @@ class PostUpdate(BaseModel):
     category_id: Optional[int] = None
 
 
+class PostBatchDelete(BaseModel):
+    post_ids: List[int] = Field(..., min_length=1, max_length=10000)
+
+
+class PostBatchMove(PostBatchDelete):
+    category_id: int = Field(..., description="Target category ID")
+
+
+class PostBatchResponse(BaseModel):
+    post_ids: List[int] = Field(
+        ..., description="Posts that existed and were affected"
+    )
+
+
 class PostResponse(PostBase):
     post_id: int
     user_id: int
@@ -113,11 +153,51 @@ class PostResponse(PostBase):
     created_at: datetime
     updated_at: datetime
     comments: List[CommentResponse] = []
+    images: List["PostImageResponse"] = Field(
+        [], validation_alias=AliasChoices("images", "post_images")
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class PostSummaryResponse(BaseModel):
+    post_id: int
+    title: str
+    category_id: int
+    user_id: int
+    nickname: str
+    view_count: int = 0
+    comment_count: int = 0
+    like_count: int = 0
+    created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class PostPageResponse(BaseModel):
+    items: List[PostSummaryResponse] = []
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page (null on the last page)"
+    )
+
+
+class PostSearchHitResponse(PostSummaryResponse):
+    score: float = Field(..., description="Relevance score (higher is better)")
+    title_highlight: str = Field(..., description="HTML-escaped title with <mark> tags")
+    snippet: str = Field(
+        ..., description="HTML-escaped content excerpt with <mark> tags"
+    )
+
+
+class PostSearchPageResponse(BaseModel):
+    items: List[PostSearchHitResponse] = []
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page (null on the last page)"
+    )
+
+
 class PostImageBase(BaseModel):
     image_url: Optional[str] = Field(None, description="Image URL")
     original_filename: Optional[str] = Field(None, description="Original filename")
@@ -131,6 +211,67 @@ class PostImageUpdate(PostImageBase):
     pass
 
 
+class PostImageVariantResponse(BaseModel):
+    width: int
+    height: int
+    jpeg: Optional[str] = Field(None, description="JPEG URL (opaque images)")
+    png: Optional[str] = Field(None, description="PNG URL (images with alpha)")
+    webp: Optional[str] = Field(None, description="WebP URL")
+
+
+class PostImageResponse(PostImageBase):
+    post_image_id: int
+    post_id: int
+    status: str = Field(..., description="pending, ready or failed")
+    width: Optional[int] = None
+    height: Optional[int] = None
+    thumbnails: Dict[str, PostImageVariantResponse] = Field(
+        {},
+        validation_alias=AliasChoices("thumbnails", "variants"),
+        description="Resized variants by size name (thumb, small, medium)",
+    )
+
+    @field_validator("thumbnails", mode="before")
+    @classmethod
+    def empty_until_processed(cls, value):
+        return value or {}
+
+    class Config:
+        from_attributes = True
+
+
+class NotificationResponse(BaseModel):
+    notification_id: int
+    kind: str = Field(..., description="comment, reply, thread or like")
+    actor_id: int
+    actor_nickname: str
+    post_id: int
+    comment_id: Optional[int] = None
+    is_read: bool = False
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class NotificationPageResponse(BaseModel):
+    items: List[NotificationResponse] = []
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page (null on the last page)"
+    )
+    unread_count: int = 0
+
+
+class NotificationRead(BaseModel):
+    up_to: Optional[int] = Field(
+        None, description="Mark notifications up to this id as read (default: all)"
+    )
+
+
+class UnreadCountResponse(BaseModel):
+    unread_count: int
+
+
 class LikeBase(BaseModel):
     is_liked: bool = Field(False, description="Like status")
 
@@ -144,6 +285,11 @@ class LikeUpdate(LikeBase):
     pass
 
 
+class LikeResponse(LikeBase):
+    post_id: int
+    like_count: int = 0
+
+
 __all__ = [
     # Pydantic request models
     "UserBase",
@@ -155,21 +301,35 @@ __all__ = [
     "PostBase",
     "PostCreate",
     "PostUpdate",
+    "PostBatchDelete",
+    "PostBatchMove",
     "CommentBase",
     "CommentCreate",
     "CommentUpdate",
     "PostImageBase",
     "PostImageCreate",
     "PostImageUpdate",
+    "NotificationRead",
     "LikeBase",
     "LikeCreate",
     "LikeUpdate",
     # Pydantic response models
     "UserResponse",
+    "AccountDeletionJobResponse",
     "CategoryResponse",
     "PostResponse",
+    "PostSummaryResponse",
+    "PostPageResponse",
+    "PostBatchResponse",
+    "PostSearchHitResponse",
+    "PostSearchPageResponse",
     "PostDetailResponse",
     "CommentResponse",
+    "CommentPageResponse",
     "PostImageResponse",
+    "PostImageVariantResponse",
+    "NotificationResponse",
+    "NotificationPageResponse",
+    "UnreadCountResponse",
     "LikeResponse",
 ]
@@ -0,0 +1,298 @@
+"""Post search backends.
+
+On MySQL, search runs against the FULLTEXT (ngram parser) index on
+posts.title/posts.content declared in app/models.py. Elsewhere (SQLite in
+tests and local development) an in-process inverted index with the same
+bigram tokenization is used. Both rank by relevance and are selected by
+`get_search_backend()`; set SEARCH_BACKEND=memory to force the in-process one.
+"""
+
+import heapq
+import html
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.models import Post
+
+NGRAM_SIZE = 2  # matches MySQL's default ngram_token_size
+SNIPPET_RADIUS = 60
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_BOOLEAN_OPERATORS_RE = re.compile(r'[+\-<>()~*"@]')
+
+
+@dataclass
+class SearchHit:
+    post_id: int
+    score: float
+
+
+def split_words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into ngram tokens the same way MySQL's ngram parser does"""
+    tokens = []
+    for word in split_words(text):
+        if len(word) <= NGRAM_SIZE:
+            tokens.append(word)
+        else:
+            tokens.extend(
+                word[i : i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)
+            )
+    return tokens
+
+
+def highlight(text: str, words: List[str]) -> str:
+    """HTML-escape text and wrap every occurrence of the query words in <mark>"""
+    if not words:
+        return html.escape(text)
+    pattern = re.compile("|".join(re.escape(w) for w in words), re.IGNORECASE)
+    parts = []
+    last = 0
+    for m in pattern.finditer(text):
+        parts.append(html.escape(text[last : m.start()]))
+        parts.append(f"<mark>{html.escape(m.group(0))}</mark>")
+        last = m.end()
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
+
+
+def make_snippet(text: str, words: List[str]) -> str:
+    """Highlighted excerpt of `text` around the first query word it contains"""
+    lowered = text.lower()
+    positions = [p for p in (lowered.find(w) for w in words) if p >= 0]
+    start = max(min(positions) - SNIPPET_RADIUS, 0) if positions else 0
+    end = min(start + SNIPPET_RADIUS * 2, len(text))
+    snippet = highlight(text[start:end], words)
+    if start > 0:
+        snippet = "..." + snippet
+    if end < len(text):
+        snippet += "..."
+    return snippet
+
+
+class SearchBackend:
+    def filter(self, db: Session, query, keyword: str):
+        """Restrict a query over Post to rows matching keyword"""
+        raise NotImplementedError
+
+    def search(
+        self,
+        db: Session,
+        q: str,
+        category_id: int,
+        limit: int,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[SearchHit]:
+        """Relevance-ranked hits, best first, ranked below `after`
+
+        Hits are ordered by (score, post_id) descending; `after` is that key
+        of the last hit of the previous page.
+        """
+        raise NotImplementedError
+
+    def index_post(self, post: Post):
+        pass
+
+    def remove_post(self, post_id: int):
+        pass
+
+    def move_post(self, post_id: int, category_id: int):
+        pass
+
+
+class FullTextSearchBackend(SearchBackend):
+    """MySQL FULLTEXT index (WITH PARSER ngram) on posts(title, content)"""
+
+    @staticmethod
+    def _boolean_query(q: str) -> str:
+        # Every word must appear as a phrase; with the ngram parser a quoted
+        # word matches its consecutive bigrams, i.e. a substring match.
+        words = _BOOLEAN_OPERATORS_RE.sub(" ", q).split()
+        return " ".join(f'+"{w}"' for w in words)
+
+    def filter(self, db: Session, query, keyword: str):
+        return query.filter(
+            match(
+                Post.title, Post.content, against=self._boolean_query(keyword)
+            ).in_boolean_mode()
+        )
+
+    def search(self, db, q, category_id, limit, after=None):
+        score = match(Post.title, Post.content, against=q).in_natural_language_mode()
+        query = self.filter(db, db.query(Post.post_id, score.label("score")), q)
+        if category_id != -1:
+            query = query.filter(Post.category_id == category_id)
+        if after is not None:
+            after_score, after_post_id = after
+            query = query.filter(
+                or_(
+                    score < after_score,
+                    and_(score == after_score, Post.post_id < after_post_id),
+                )
+            )
+        rows = query.order_by(score.desc(), Post.post_id.desc()).limit(limit).all()
+        return [SearchHit(post_id=row.post_id, score=float(row.score)) for row in rows]
+
+
+class InvertedIndexSearchBackend(SearchBackend):
+    """In-process inverted index, built lazily from the posts table
+
+    Changes made while the initial load runs are queued and applied after
+    it, since the load's snapshot may or may not include them. Before the
+    load starts they are dropped: the load reads them from the table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        # Guards _loading/_loaded transitions and the changes queued meanwhile
+        self._pending_lock = threading.Lock()
+        self._loading = False
+        self._pending: List[Tuple[Callable, tuple]] = []
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._documents: Dict[int, Set[str]] = {}
+        self._categories: Dict[int, int] = {}
+
+    def _ensure_loaded(self, db: Session):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with self._pending_lock:
+                self._loading = True
+            try:
+                rows = db.query(
+                    Post.post_id, Post.title, Post.content, Post.category_id
+                ).yield_per(1000)
+                for row in rows:
+                    self._add(row.post_id, row.title, row.content, row.category_id)
+            except Exception:
+                with self._pending_lock:
+                    self._loading = False
+                    self._pending = []  # the next load reads them from the table
+                raise
+            with self._pending_lock:
+                for apply, args in self._pending:
+                    apply(*args)
+                self._pending = []
+                self._loading = False
+                self._loaded = True
+
+    def _apply(self, apply: Callable, *args):
+        """Apply a change now, queue it during the load, or leave it to the load"""
+        with self._pending_lock:
+            if not self._loaded:
+                if self._loading:
+                    self._pending.append((apply, args))
+                return
+        with self._lock:
+            apply(*args)
+
+    def _add(self, post_id: int, title: str, content: str, category_id: int):
+        self._remove(post_id)
+        counts: Dict[str, int] = defaultdict(int)
+        for token in tokenize(f"{title} {content}"):
+            counts[token] += 1
+        for token, tf in counts.items():
+            self._postings[token][post_id] = tf
+        self._documents[post_id] = set(counts)
+        self._categories[post_id] = category_id
+
+    def _remove(self, post_id: int):
+        for token in self._documents.pop(post_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(post_id, None)
+                if not postings:
+                    del self._postings[token]
+        self._categories.pop(post_id, None)
+
+    def _matches(self, q: str) -> Dict[int, float]:
+        tokens = set(tokenize(q))
+        if not tokens:
+            return {}
+        postings = [self._postings.get(t, {}) for t in tokens]
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        if not candidates:
+            return {}
+        for p in postings[1:]:
+            candidates.intersection_update(p)
+            if not candidates:
+                return {}
+        total = len(self._documents) or 1
+        scores: Dict[int, float] = {}
+        for p in postings:
+            idf = math.log(1 + total / len(p))
+            for post_id in candidates:
+                scores[post_id] = scores.get(post_id, 0.0) + p[post_id] * idf
+        return scores
+
+    def filter(self, db, query, keyword):
+        self._ensure_loaded(db)
+        with self._lock:
+            post_ids = list(self._matches(keyword))
+        return query.filter(Post.post_id.in_(post_ids))
+
+    def search(self, db, q, category_id, limit, after=None):
+        self._ensure_loaded(db)
+        with self._lock:
+            scores = self._matches(q)
+            if category_id != -1:
+                scores = {
+                    pid: s
+                    for pid, s in scores.items()
+                    if self._categories.get(pid) == category_id
+                }
+        hits = ((score, pid) for pid, score in scores.items())
+        if after is not None:
+            hits = (hit for hit in hits if hit < after)
+        return [
+            SearchHit(post_id=pid, score=score)
+            for score, pid in heapq.nlargest(limit, hits)
+        ]
+
+    def index_post(self, post: Post):
+        self._apply(self._add, post.post_id, post.title, post.content, post.category_id)
+
+    def remove_post(self, post_id: int):
+        self._apply(self._remove, post_id)
+
+    def move_post(self, post_id: int, category_id: int):
+        self._apply(self._move, post_id, category_id)
+
+    def _move(self, post_id: int, category_id: int):
+        if post_id in self._categories:
+            self._categories[post_id] = category_id
+
+
+_backends: Dict[str, SearchBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_search_backend(db: Session) -> SearchBackend:
+    name: Optional[str] = os.getenv("SEARCH_BACKEND")
+    if not name:
+        name = "fulltext" if db.get_bind().dialect.name == "mysql" else "memory"
+    with _backends_lock:
+        if name not in _backends:
+            if name == "fulltext":
+                _backends[name] = FullTextSearchBackend()
+            elif name == "memory":
+                _backends[name] = InvertedIndexSearchBackend()
+            else:
+                raise ValueError(f"Unknown SEARCH_BACKEND: {name}")
+        return _backends[name]
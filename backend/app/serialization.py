@@ -0,0 +1,58 @@
+"""JSON encoding for response bodies, without jsonable_encoder.
+
+Read endpoints build their payloads from row tuples (`row_dict`) where they
+can, so the rows are neither hydrated into ORM objects nor validated into
+response models. `dumps` then writes the body in one pass:
+
+- pydantic models go through their own compiled serializer,
+- lists of one model type through a `TypeAdapter(List[model])` built once
+  per type and reused,
+- everything else (dicts and lists from rows) through orjson, which also
+  encodes datetimes and enums natively.
+
+The output matches what the response models would produce for the same
+data, as long as row payloads are shaped like the schema (see `row_dict`).
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Type
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(payload) -> bytes:
+    if isinstance(payload, BaseModel):
+        return payload.__pydantic_serializer__.to_json(payload)
+    if isinstance(payload, list) and payload and isinstance(payload[0], BaseModel):
+        model = type(payload[0])
+        if all(type(item) is model for item in payload):
+            return list_adapter(model).dump_json(payload)
+    return orjson.dumps(payload, default=_default)
+
+
+def row_dict(row, nested: Optional[dict] = None) -> dict:
+    """A result row as a dict, with prefixed columns folded into sub-dicts
+
+    `nested` maps a prefix to a key: with {"user__": "user"}, the columns
+    user__user_id, user__nickname, ... become row["user"]["user_id"], ...
+    """
+    data = row._asdict()
+    for prefix, key in (nested or {}).items():
+        data[key] = {
+            name[len(prefix) :]: data.pop(name)
+            for name in list(data)
+            if name.startswith(prefix)
+        }
+    return data
@@ -0,0 +1,91 @@
+"""Object storage for uploaded media.
+
+Handlers and the image pipeline only use the `ObjectStore` interface, which
+works with local files (`save` takes a file path, `save_stream` an open file,
+and `local_path` returns one to read from). Another backend, e.g. S3, can be
+swapped in by implementing it and returning it from `create_object_store()`.
+`LocalObjectStore` keeps objects under MEDIA_ROOT and serves them at
+MEDIA_URL through the static files mount in app/main.py.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import BinaryIO
+
+MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", "media"))
+MEDIA_URL = os.getenv("MEDIA_URL", "/media")
+
+
+class ObjectStore:
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def save(self, key: str, source: Path):
+        """Store the file at `source` under `key` (the source is left in place)"""
+        raise NotImplementedError
+
+    def save_stream(self, key: str, source: BinaryIO):
+        """Store what is left to read of the file object `source` under `key`"""
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Path:
+        """A local file with the object's content, for processing"""
+        raise NotImplementedError
+
+    def url(self, key: str) -> str:
+        raise NotImplementedError
+
+    def temp_dir(self) -> Path:
+        """Scratch space for uploads in flight"""
+        return Path(tempfile.gettempdir())
+
+
+class LocalObjectStore(ObjectStore):
+    def __init__(self, root: Path = MEDIA_ROOT, base_url: str = MEDIA_URL):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def save(self, key: str, source: Path):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Copy next to the target, then rename: readers never see a partial file
+        partial = path.with_name(f".{path.name}.{os.getpid()}.partial")
+        shutil.copyfile(source, partial)
+        os.replace(partial, path)
+
+    def save_stream(self, key: str, source: BinaryIO):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f".{path.name}.{os.getpid()}.partial")
+        with open(partial, "wb") as out:
+            shutil.copyfileobj(source, out)
+        os.replace(partial, path)
+
+    def local_path(self, key: str) -> Path:
+        return self._path(key)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def temp_dir(self) -> Path:
+        path = self.root / ".uploads"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+
+def create_object_store() -> ObjectStore:
+    return LocalObjectStore()
+
+
+object_store = create_object_store()
@@ -0,0 +1,169 @@
+"""Write-behind buffer for Post.view_count.
+
+Reads only record a view in memory (or in the shared store); a background
+task started from the app lifespan periodically drains the aggregated deltas
+and applies them with one batched `UPDATE posts SET view_count = view_count
++ :n` per chunk, plus a final flush on shutdown.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, update
+
+from app.database import async_engine
+from app.kvstore import get_shared_client
+from app.models import Post
+
+logger = logging.getLogger(__name__)
+
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "10"))
+VIEW_DEDUPE_SECONDS = int(os.getenv("VIEW_DEDUPE_SECONDS", "600"))  # 0 disables
+VIEW_DEDUPE_MAX_KEYS = 100_000
+FLUSH_BATCH_SIZE = 500
+
+posts_table = Post.__table__
+_increment_view_count = (
+    update(posts_table)
+    .where(posts_table.c.post_id == bindparam("b_post_id"))
+    .values(
+        view_count=posts_table.c.view_count + bindparam("b_delta"),
+        updated_at=posts_table.c.updated_at,  # a view is not an edit
+    )
+)
+
+
+class InMemoryViewStore:
+    """Per-process pending deltas and recently-seen viewers"""
+
+    def __init__(self, max_seen: int = VIEW_DEDUPE_MAX_KEYS):
+        self._lock = threading.Lock()
+        self._pending: Dict[int, int] = {}
+        self._seen: "OrderedDict[tuple, float]" = OrderedDict()
+        self._max_seen = max_seen
+
+    def incr(self, post_id: int, n: int = 1):
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + n
+
+    def drain(self) -> Dict[int, int]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, deltas: Dict[int, int]):
+        for post_id, n in deltas.items():
+            self.incr(post_id, n)
+
+    def first_view(self, post_id: int, viewer: str, window: int) -> bool:
+        now = time.monotonic()
+        key = (post_id, viewer)
+        with self._lock:
+            expires_at = self._seen.get(key)
+            if expires_at is not None and expires_at > now:
+                return False
+            self._seen[key] = now + window
+            self._seen.move_to_end(key)
+            while len(self._seen) > self._max_seen:
+                self._seen.popitem(last=False)
+            return True
+
+
+class RedisViewStore:
+    """Deltas and dedupe keys shared by all workers through a redis client"""
+
+    PENDING_KEY = "views:pending"
+
+    def __init__(self, client):
+        self._client = client
+
+    def incr(self, post_id: int, n: int = 1):
+        self._client.hincrby(self.PENDING_KEY, post_id, n)
+
+    def drain(self) -> Dict[int, int]:
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hgetall(self.PENDING_KEY)
+        pipe.delete(self.PENDING_KEY)
+        pending, _ = pipe.execute()
+        return {int(post_id): int(n) for post_id, n in pending.items()}
+
+    def restore(self, deltas: Dict[int, int]):
+        pipe = self._client.pipeline(transaction=True)
+        for post_id, n in deltas.items():
+            pipe.hincrby(self.PENDING_KEY, post_id, n)
+        pipe.execute()
+
+    def first_view(self, post_id: int, viewer: str, window: int) -> bool:
+        key = f"views:seen:{post_id}:{viewer}"
+        return bool(self._client.set(key, 1, ex=window, nx=True))
+
+
+class ViewCounter:
+    def __init__(self, store, dedupe_seconds: int = VIEW_DEDUPE_SECONDS):
+        self.store = store
+        self.dedupe_seconds = dedupe_seconds
+        self._flushing: Optional[asyncio.Future] = None
+
+    def record(self, post_id: int, viewer: Optional[str] = None) -> bool:
+        """Count a view unless `viewer` already viewed the post in the window"""
+        if self.dedupe_seconds and viewer:
+            if not self.store.first_view(post_id, viewer, self.dedupe_seconds):
+                return False
+        self.store.incr(post_id)
+        return True
+
+    async def flush(self, bind=None) -> int:
+        """Apply pending deltas to posts.view_count; returns rows updated"""
+        if self._flushing is not None and not self._flushing.done():
+            try:
+                await self._flushing  # the periodic flush cut off by shutdown
+            except Exception:
+                pass  # already logged, and its deltas restored
+        return await self._flush(bind)
+
+    async def _flush(self, bind=None) -> int:
+        bind = async_engine if bind is None else bind
+        deltas = self.store.drain()
+        if not deltas:
+            return 0
+        # Sorted so concurrent flushers from other workers lock rows in the same order
+        params = [
+            {"b_post_id": post_id, "b_delta": n}
+            for post_id, n in sorted(deltas.items())
+        ]
+        try:
+            async with bind.begin() as conn:
+                for i in range(0, len(params), FLUSH_BATCH_SIZE):
+                    await conn.execute(
+                        _increment_view_count, params[i : i + FLUSH_BATCH_SIZE]
+                    )
+        except Exception:
+            logger.exception("Failed to flush %d view count deltas", len(params))
+            self.store.restore(deltas)
+            raise
+        return len(params)
+
+    async def run(self, interval: float = VIEW_FLUSH_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            # Shielded: cancelling run() on shutdown must not drop deltas that
+            # were drained but not written yet (flush() waits for them)
+            self._flushing = asyncio.ensure_future(self._flush())
+            try:
+                await asyncio.shield(self._flushing)
+            except Exception:
+                pass  # already logged; deltas are retried on the next tick
+
+
+def create_view_counter() -> ViewCounter:
+    client = get_shared_client()
+    store = RedisViewStore(client) if client is not None else InMemoryViewStore()
+    return ViewCounter(store)
+
+
+view_counter = create_view_counter()
@@ -0,0 +1,297 @@
+"""Drive the API hot paths in-process and compare against a stored baseline.
+
+    DATABASE_URL=sqlite:///bench.db python -m benchmarks.seed
+    DATABASE_URL=sqlite:///bench.db python -m benchmarks.run --check
+
+Requests go through the real ASGI app (middleware, dependencies, response
+cache, lifespan tasks) over `httpx.ASGITransport`, so no server or network
+is involved. Every scenario runs at each --concurrency level and reports
+throughput, p50/p95/p99 latency, SQL statements per request (read from the
+X-DB-Queries header added by app.metrics) and the process's peak RSS.
+
+Results are compared with benchmarks/baseline.json: a scenario regresses if
+its p95 or throughput is worse than the baseline by more than --tolerance,
+or if it issues more queries per request. `--check` exits non-zero on a
+regression (for CI) and `--save-baseline` replaces the baseline. Any failed
+request (4xx/5xx) is a regression too, and a run with failures is never
+saved as the baseline. Rate limits (app.ratelimit) are switched off, since
+each scenario sends far more writes per caller than they allow. Baselines
+are only comparable on the same machine, database and seed volumes.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import func, select
+
+from app import ratelimit
+from app.database import async_engine, engine
+from app.main import app, create_access_token
+from app.models import Category, Post, User
+from app.pagination import encode_cursor
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+AUTH_USERS = 100
+
+
+class Fixture:
+    """Ids sampled from the seeded database, and a token per sampled user"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        with engine.connect() as conn:
+            self.max_post_id = conn.scalar(select(func.max(Post.post_id))) or 0
+            self.post_span = conn.execute(
+                select(func.min(Post.created_at), func.max(Post.created_at))
+            ).one()
+            self.category_ids = conn.scalars(select(Category.category_id)).all()
+            user_ids = conn.scalars(
+                select(User.user_id).order_by(User.user_id).limit(AUTH_USERS)
+            ).all()
+            self.volumes = {
+                "users": conn.scalar(select(func.count()).select_from(User)),
+                "posts": conn.scalar(select(func.count()).select_from(Post)),
+            }
+        if not self.max_post_id or not user_ids:
+            sys.exit("No data to benchmark; run `python -m benchmarks.seed` first")
+        self.tokens = [
+            {"Authorization": f"Bearer {create_access_token({'sub': str(uid)})}"}
+            for uid in user_ids
+        ]
+
+    def post_id(self) -> int:
+        return self.rng.randint(1, self.max_post_id)
+
+    def auth(self) -> dict:
+        return self.rng.choice(self.tokens)
+
+
+def _get_posts(f: Fixture):
+    # Each request is a different page (sort, filter, limit and keyset cursor
+    # at a random depth), so this measures the keyset query, not cache hits
+    sort = f.rng.choice(("latest", "latest", "likes", "comments"))
+    params = {"limit": f.rng.choice((10, 20, 50)), "sort": sort}
+    if f.rng.random() < 0.5:
+        params["category_id"] = f.rng.choice(f.category_ids)
+    if f.rng.random() < 0.8:
+        if sort == "latest":
+            oldest, newest = f.post_span
+            after = oldest + (newest - oldest) * f.rng.random()
+        else:
+            after = f.rng.randint(0, 10)
+        params["cursor"] = encode_cursor(after, f.post_id())
+    return "GET", "/api/posts", {"params": params}
+
+
+def _get_post_by_id(f: Fixture):
+    return "GET", f"/api/posts/{f.post_id()}", {}
+
+
+def _get_post_comments(f: Fixture):
+    return "GET", f"/api/posts/{f.post_id()}/comments", {}
+
+
+def _create_post(f: Fixture):
+    body = {
+        "title": "benchmark post",
+        "content": "benchmark content " * 20,
+        "category_id": f.rng.choice(f.category_ids),
+    }
+    return "POST", "/api/posts", {"json": body, "headers": f.auth()}
+
+
+def _create_comment(f: Fixture):
+    body = {"content": "benchmark comment"}
+    return (
+        "POST",
+        f"/api/posts/{f.post_id()}/comments",
+        {"json": body, "headers": f.auth()},
+    )
+
+
+SCENARIOS = {
+    "get_posts": _get_posts,
+    "get_post_by_id": _get_post_by_id,
+    "get_post_comments": _get_post_comments,
+    "create_post": _create_post,
+    "create_comment": _create_comment,
+}
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+async def run_scenario(client, fixture, make_request, concurrency, n_requests):
+    latencies = []
+    queries = []
+    errors = 0
+    remaining = iter(range(n_requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, url, kwargs = make_request(fixture)
+            headers = {"X-Debug-Queries": "1", **kwargs.pop("headers", {})}
+            start = time.perf_counter()
+            response = await client.request(method, url, headers=headers, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+            queries.append(int(response.headers.get("x-db-queries", 0)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "throughput_rps": round(n_requests / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "queries_per_request": round(statistics.fmean(queries), 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+async def run(scenarios, concurrency_levels, n_requests, warmup, seed):
+    fixture = Fixture(random.Random(seed))
+    results = {}
+    # An unhandled error in the app is a 500 (a failed request), as behind a
+    # server, instead of aborting the whole run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            for name in scenarios:
+                make_request = SCENARIOS[name]
+                if warmup:
+                    await run_scenario(client, fixture, make_request, 1, warmup)
+                for concurrency in concurrency_levels:
+                    key = f"{name}@{concurrency}"
+                    results[key] = await run_scenario(
+                        client, fixture, make_request, concurrency, n_requests
+                    )
+                    print(_format_row(key, results[key]), flush=True)
+    # aiosqlite connections run on non-daemon threads that would block exit
+    await async_engine.dispose()
+    meta = {
+        "dialect": engine.dialect.name,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "requests": n_requests,
+        **fixture.volumes,
+    }
+    return {"meta": meta, "results": results}
+
+
+def _format_row(key, r) -> str:
+    return (
+        f"{key:<24} {r['throughput_rps']:>9.1f} rps  p50 {r['p50_ms']:>8.2f}  "
+        f"p95 {r['p95_ms']:>8.2f}  p99 {r['p99_ms']:>8.2f} ms  "
+        f"{r['queries_per_request']:>5.1f} q/req  {r['errors']} err  "
+        f"rss {r['peak_rss_mb']:.0f} MB"
+    )
+
+
+def compare(report, baseline, tolerance):
+    """Return the list of regressions against the baseline"""
+    # Volumes drift as the write scenarios add rows; the rest must match
+    keys = ("dialect", "python", "machine", "requests")
+    if any(baseline["meta"].get(key) != report["meta"][key] for key in keys):
+        print(f"warning: baseline was recorded with {baseline['meta']}")
+    regressions = []
+    for key, result in report["results"].items():
+        if result["errors"]:
+            regressions.append(f"{key}: {result['errors']} failed requests")
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        p95_change = result["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0
+        rps_change = result["throughput_rps"] / base["throughput_rps"] - 1
+        print(
+            f"{key:<24} p95 {p95_change:+7.1%}  throughput {rps_change:+7.1%}  "
+            f"queries {base['queries_per_request']} -> "
+            f"{result['queries_per_request']}"
+        )
+        if p95_change > tolerance:
+            regressions.append(f"{key}: p95 {base['p95_ms']} -> {result['p95_ms']} ms")
+        if rps_change < -tolerance:
+            regressions.append(
+                f"{key}: throughput {base['throughput_rps']} -> "
+                f"{result['throughput_rps']} rps"
+            )
+        # Query counts are deterministic per endpoint; allow sampling noise only
+        if result["queries_per_request"] > base["queries_per_request"] + 0.5:
+            regressions.append(
+                f"{key}: queries/request {base['queries_per_request']} -> "
+                f"{result['queries_per_request']}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="comma-separated names"
+    )
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 on regression")
+    args = parser.parse_args()
+
+    scenarios = args.scenarios.split(",")
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if args.requests < 2:
+        parser.error("--requests must be at least 2")
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    # The scenarios replay a handful of users far beyond the per-caller limits
+    ratelimit.RATE_LIMIT_ENABLED = False
+    report = asyncio.run(run(scenarios, levels, args.requests, args.warmup, args.seed))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    failed = [key for key, result in report["results"].items() if result["errors"]]
+    if args.save_baseline and failed:
+        print(f"Not saving a baseline with failed requests in {', '.join(failed)}")
+        return 1
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline")
+        return 0
+
+    regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
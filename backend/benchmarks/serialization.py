@@ -0,0 +1,177 @@
+"""CPU per 1k-item response for the post list and comment thread bodies.
+
+    python -m benchmarks.serialization --items 1000 --repeat 30
+
+Each side builds the response body from the same in-memory SQLite data, from
+the query to the encoded bytes, and is timed with process CPU time:
+
+- before: ORM objects / rows validated into the response models, then
+  jsonable_encoder + json.dumps (the cached read path before row payloads)
+- after:  row tuples as dicts, encoded by app.serialization.dumps (orjson)
+
+Only serialization work differs between the two, so the database is kept
+small and in memory; see benchmarks.run for end-to-end latency.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.loaders import COMMENT_OPTIONS
+from app.main import comment_page, comment_query, post_page, post_summary_query
+from app.models import Category, CategoryStatus, Comment, Post, User
+from app.schemas import (
+    CommentPageResponse,
+    CommentResponse,
+    PostPageResponse,
+    PostSummaryResponse,
+)
+from app.serialization import dumps
+
+
+def seed(db: Session, n_items: int):
+    now = datetime(2026, 1, 1)
+    db.add(Category(category_id=1, category_status=CategoryStatus.FREE))
+    db.execute(
+        insert(User),
+        [
+            {"user_id": i, "social_id": f"bench{i}", "nickname": f"user{i}"}
+            for i in range(1, 101)
+        ],
+    )
+    db.execute(
+        insert(Post),
+        [
+            {
+                "post_id": i,
+                "title": f"벤치마크 게시글 {i}",
+                "content": "본문",
+                "category_id": 1,
+                "user_id": i % 100 + 1,
+                "created_at": now + timedelta(seconds=i),
+                "updated_at": now + timedelta(seconds=i),
+            }
+            for i in range(1, n_items + 1)
+        ],
+    )
+    db.execute(
+        insert(Comment),
+        [
+            {
+                "comment_id": i,
+                "content": f"댓글 {i}",
+                "post_id": 1,
+                "user_id": i % 100 + 1,
+                "path": f"{i:010d}/",
+                "created_at": now + timedelta(seconds=i),
+                "updated_at": now + timedelta(seconds=i),
+            }
+            for i in range(1, n_items + 1)
+        ],
+    )
+    db.commit()
+
+
+def legacy_dumps(payload) -> bytes:
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def posts_before(db: Session, n_items: int) -> bytes:
+    rows = (
+        post_summary_query(db)
+        .order_by(Post.created_at.desc(), Post.post_id.desc())
+        .limit(n_items)
+        .all()
+    )
+    items = [PostSummaryResponse.model_validate(row) for row in rows]
+    return legacy_dumps(PostPageResponse(items=items, next_cursor=None))
+
+
+def posts_after(db: Session, n_items: int) -> bytes:
+    return dumps(post_page(db, "", -1, "latest", None, n_items))
+
+
+def comments_before(db: Session, n_items: int) -> bytes:
+    comments = (
+        db.query(Comment)
+        .options(*COMMENT_OPTIONS)
+        .filter(Comment.post_id == 1, Comment.parent_id.is_(None))
+        .order_by(Comment.comment_id)
+        .limit(n_items)
+        .all()
+    )
+    items = [CommentResponse.model_validate(c) for c in comments]
+    return legacy_dumps(CommentPageResponse(items=items, next_cursor=None))
+
+
+def comments_after(db: Session, n_items: int) -> bytes:
+    rows = (
+        comment_query(db)
+        .filter(Comment.post_id == 1, Comment.parent_id.is_(None))
+        .order_by(Comment.comment_id)
+        .limit(n_items)
+        .all()
+    )
+    return dumps(comment_page(rows, n_items, lambda row: row.comment_id))
+
+
+SCENARIOS = {
+    "post_list": (posts_before, posts_after),
+    "comment_threads": (comments_before, comments_after),
+}
+
+
+def cpu_ms(build, db: Session, n_items: int, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        db.expunge_all()  # the ORM side hydrates fresh objects every time
+        start = time.process_time()
+        build(db, n_items)
+        samples.append((time.process_time() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        seed(db, args.items)
+        print(f"{'scenario':<16} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+        for name, (before, after) in SCENARIOS.items():
+            # Both sides must produce the same document
+            if json.loads(before(db, args.items)) != json.loads(after(db, args.items)):
+                print(f"{name}: before and after bodies differ")
+                return 1
+            for build in (before, after):  # warm up
+                build(db, args.items)
+            before_ms = cpu_ms(before, db, args.items, args.repeat)
+            after_ms = cpu_ms(after, db, args.items, args.repeat)
+            print(
+                f"{name:<16} {before_ms:>10.2f} {after_ms:>10.2f} "
+                f"{before_ms / after_ms:>7.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""initial schema
+
+Tables as they existed before migrations were introduced. Databases created
+earlier (e.g. with Base.metadata.create_all) should be marked with
+`alembic stamp 0001` and then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("social_id", sa.VARCHAR(length=255), nullable=False),
+        sa.Column("nickname", sa.VARCHAR(length=255), nullable=False),
+        sa.Column("profile_image", sa.VARCHAR(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("is_admin", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("total_points", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", name=op.f("pk_users")),
+    )
+    op.create_index(op.f("ix_users_user_id"), "users", ["user_id"])
+    op.create_index(op.f("ix_users_social_id"), "users", ["social_id"], unique=True)
+
+    op.create_table(
+        "categories",
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "category_status",
+            sa.Enum("FREE", "TIP", "QUESTION", name="categorystatus"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("category_id", name=op.f("pk_categories")),
+    )
+    op.create_index(op.f("ix_categories_category_id"), "categories", ["category_id"])
+
+    op.create_table(
+        "posts",
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.VARCHAR(length=255), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("view_count", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.user_id"], name=op.f("fk_posts_user_id_users")
+        ),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["categories.category_id"],
+            name=op.f("fk_posts_category_id_categories"),
+        ),
+        sa.PrimaryKeyConstraint("post_id", name=op.f("pk_posts")),
+    )
+    op.create_index(op.f("ix_posts_post_id"), "posts", ["post_id"])
+
+    op.create_table(
+        "comments",
+        sa.Column("comment_id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["post_id"], ["posts.post_id"], name=op.f("fk_comments_post_id_posts")
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.user_id"], name=op.f("fk_comments_user_id_users")
+        ),
+        sa.PrimaryKeyConstraint("comment_id", name=op.f("pk_comments")),
+    )
+    op.create_index(op.f("ix_comments_comment_id"), "comments", ["comment_id"])
+
+    op.create_table(
+        "post_images",
+        sa.Column("post_image_id", sa.Integer(), nullable=False),
+        sa.Column("image_url", sa.Text(), nullable=True),
+        sa.Column("original_filename", sa.VARCHAR(length=255), nullable=True),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["post_id"], ["posts.post_id"], name=op.f("fk_post_images_post_id_posts")
+        ),
+        sa.PrimaryKeyConstraint("post_image_id", name=op.f("pk_post_images")),
+    )
+    op.create_index(
+        op.f("ix_post_images_post_image_id"), "post_images", ["post_image_id"]
+    )
+
+    op.create_table(
+        "likes",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("is_liked", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.user_id"], name=op.f("fk_likes_user_id_users")
+        ),
+        sa.ForeignKeyConstraint(
+            ["post_id"], ["posts.post_id"], name=op.f("fk_likes_post_id_posts")
+        ),
+        sa.PrimaryKeyConstraint("user_id", "post_id", name=op.f("pk_likes")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("likes")
+    op.drop_index(op.f("ix_post_images_post_image_id"), table_name="post_images")
+    op.drop_table("post_images")
+    op.drop_index(op.f("ix_comments_comment_id"), table_name="comments")
+    op.drop_table("comments")
+    op.drop_index(op.f("ix_posts_post_id"), table_name="posts")
+    op.drop_table("posts")
+    op.drop_index(op.f("ix_categories_category_id"), table_name="categories")
+    op.drop_table("categories")
+    op.drop_index(op.f("ix_users_social_id"), table_name="users")
+    op.drop_index(op.f("ix_users_user_id"), table_name="users")
+    op.drop_table("users")
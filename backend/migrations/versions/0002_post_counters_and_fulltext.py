@@ -0,0 +1,49 @@
+"""post like/comment counters and full-text index
+
+Run `python -m app.counters` after upgrading to backfill the counters.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("posts") as batch_op:
+        batch_op.add_column(
+            sa.Column("like_count", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(
+            sa.Column("comment_count", sa.Integer(), nullable=False, server_default="0")
+        )
+
+    if op.get_bind().dialect.name == "mysql":
+        op.create_index(
+            "ix_posts_title_content_fulltext",
+            "posts",
+            ["title", "content"],
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "mysql":
+        op.drop_index("ix_posts_title_content_fulltext", table_name="posts")
+    with op.batch_alter_table("posts") as batch_op:
+        batch_op.drop_column("comment_count")
+        batch_op.drop_column("like_count")
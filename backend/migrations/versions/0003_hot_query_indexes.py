@@ -0,0 +1,46 @@
+"""composite indexes for the hot query shapes
+
+The plans are checked by tests/test_query_plans.py.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    (
+        "ix_posts_category_id_created_at",
+        "posts",
+        ["category_id", "created_at", "post_id"],
+    ),
+    ("ix_posts_created_at", "posts", ["created_at", "post_id"]),
+    ("ix_posts_like_count", "posts", ["like_count", "post_id"]),
+    ("ix_posts_comment_count", "posts", ["comment_count", "post_id"]),
+    ("ix_posts_user_id", "posts", ["user_id"]),
+    ("ix_comments_post_id_created_at", "comments", ["post_id", "created_at"]),
+    ("ix_comments_user_id", "comments", ["user_id"]),
+    ("ix_likes_post_id_user_id", "likes", ["post_id", "user_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,71 @@
+"""threaded comments (parent pointer, materialized path, reply counts)
+
+Existing comments become top-level threads.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("comments") as batch_op:
+        batch_op.add_column(
+            sa.Column("path", sa.VARCHAR(length=255), nullable=False, server_default="")
+        )
+        batch_op.add_column(
+            sa.Column("depth", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(
+            sa.Column("reply_count", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(sa.Column("parent_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            op.f("fk_comments_parent_id_comments"),
+            "comments",
+            ["parent_id"],
+            ["comment_id"],
+            ondelete="CASCADE",
+        )
+
+    # Every existing comment is the root of its own thread: "%010d/"
+    if op.get_bind().dialect.name == "mysql":
+        op.execute("UPDATE comments SET path = CONCAT(LPAD(comment_id, 10, '0'), '/')")
+    else:
+        op.execute(
+            "UPDATE comments SET path = substr('0000000000' || comment_id, -10) || '/'"
+        )
+
+    op.create_index(
+        "ix_comments_post_id_parent_id",
+        "comments",
+        ["post_id", "parent_id", "comment_id"],
+    )
+    op.create_index("ix_comments_post_id_path", "comments", ["post_id", "path"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_comments_post_id_path", table_name="comments")
+    op.drop_index("ix_comments_post_id_parent_id", table_name="comments")
+    with op.batch_alter_table("comments") as batch_op:
+        batch_op.drop_constraint(
+            op.f("fk_comments_parent_id_comments"), type_="foreignkey"
+        )
+        batch_op.drop_column("parent_id")
+        batch_op.drop_column("reply_count")
+        batch_op.drop_column("depth")
+        batch_op.drop_column("path")
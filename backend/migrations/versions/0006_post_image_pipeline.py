@@ -0,0 +1,65 @@
+"""post image upload pipeline (content hash, processing status, variants)
+
+Existing images predate the pipeline and are marked ready with no variants.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("post_images") as batch_op:
+        batch_op.add_column(
+            sa.Column("storage_key", sa.VARCHAR(length=255), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("content_hash", sa.VARCHAR(length=64), nullable=True)
+        )
+        batch_op.add_column(sa.Column("byte_size", sa.Integer(), nullable=True))
+        batch_op.add_column(
+            sa.Column(
+                "status", sa.VARCHAR(length=16), nullable=False, server_default="ready"
+            )
+        )
+        batch_op.add_column(sa.Column("width", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("height", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("variants", sa.JSON(), nullable=True))
+        batch_op.add_column(
+            sa.Column(
+                "created_at",
+                sa.DateTime(),
+                nullable=False,
+                server_default=sa.func.current_timestamp(),
+            )
+        )
+    op.create_index(
+        op.f("ix_post_images_content_hash"), "post_images", ["content_hash"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_post_images_content_hash"), table_name="post_images")
+    with op.batch_alter_table("post_images") as batch_op:
+        batch_op.drop_column("created_at")
+        batch_op.drop_column("variants")
+        batch_op.drop_column("height")
+        batch_op.drop_column("width")
+        batch_op.drop_column("status")
+        batch_op.drop_column("byte_size")
+        batch_op.drop_column("content_hash")
+        batch_op.drop_column("storage_key")
@@ -0,0 +1,71 @@
+"""delete comments, likes and images with their post (ON DELETE CASCADE)
+
+Also indexes the referencing columns that had no index of their own, so the
+database finds the rows to cascade to without a table scan.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POST_CHILD_TABLES = ("comments", "post_images", "likes")
+# Names unnamed foreign keys when SQLite batch mode reflects the table
+FK_NAMING_CONVENTION = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"
+}
+
+
+def _post_foreign_key_name(table: str) -> Union[str, None]:
+    """The current name of `table`'s post_id foreign key, as the database has it
+
+    Databases created before migrations and stamped 0001 don't follow the
+    naming convention: MySQL named their keys <table>_ibfk_N, and SQLite
+    keys can be unnamed (then named by FK_NAMING_CONVENTION in batch mode).
+    """
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        if fk["referred_table"] == "posts" and fk["constrained_columns"] == ["post_id"]:
+            return fk["name"] or f"fk_{table}_post_id_posts"
+    return None
+
+
+def _recreate_post_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table in POST_CHILD_TABLES:
+        existing = _post_foreign_key_name(table)
+        with op.batch_alter_table(
+            table, naming_convention=FK_NAMING_CONVENTION
+        ) as batch_op:
+            if existing is not None:
+                batch_op.drop_constraint(existing, type_="foreignkey")
+            batch_op.create_foreign_key(
+                op.f(f"fk_{table}_post_id_posts"),
+                "posts",
+                ["post_id"],
+                ["post_id"],
+                ondelete=ondelete,
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_post_foreign_keys("CASCADE")
+    op.create_index("ix_comments_parent_id", "comments", ["parent_id"])
+    op.create_index("ix_post_images_post_id", "post_images", ["post_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_post_images_post_id", table_name="post_images")
+    op.drop_index("ix_comments_parent_id", table_name="comments")
+    _recreate_post_foreign_keys(None)
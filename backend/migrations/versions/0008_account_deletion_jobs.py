@@ -0,0 +1,61 @@
+"""account deletion jobs
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "account_deletion_jobs",
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.VARCHAR(length=16), nullable=False),
+        sa.Column("phase", sa.VARCHAR(length=16), nullable=False),
+        sa.Column("posts_deleted", sa.Integer(), nullable=False),
+        sa.Column("comments_deleted", sa.Integer(), nullable=False),
+        sa.Column("likes_deleted", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("job_id", name=op.f("pk_account_deletion_jobs")),
+    )
+    op.create_index(
+        op.f("ix_account_deletion_jobs_job_id"), "account_deletion_jobs", ["job_id"]
+    )
+    op.create_index(
+        op.f("ix_account_deletion_jobs_user_id"), "account_deletion_jobs", ["user_id"]
+    )
+    op.create_index(
+        "ix_account_deletion_jobs_status",
+        "account_deletion_jobs",
+        ["status", "job_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_account_deletion_jobs_status", table_name="account_deletion_jobs")
+    op.drop_index(
+        op.f("ix_account_deletion_jobs_user_id"), table_name="account_deletion_jobs"
+    )
+    op.drop_index(
+        op.f("ix_account_deletion_jobs_job_id"), table_name="account_deletion_jobs"
+    )
+    op.drop_table("account_deletion_jobs")
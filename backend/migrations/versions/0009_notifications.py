@@ -0,0 +1,87 @@
+"""notifications
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "notifications",
+        sa.Column("notification_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.VARCHAR(length=16), nullable=False),
+        sa.Column("is_read", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("actor_id", sa.Integer(), nullable=False),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("comment_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.user_id"],
+            name=op.f("fk_notifications_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["actor_id"],
+            ["users.user_id"],
+            name=op.f("fk_notifications_actor_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["post_id"],
+            ["posts.post_id"],
+            name=op.f("fk_notifications_post_id_posts"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["comment_id"],
+            ["comments.comment_id"],
+            name=op.f("fk_notifications_comment_id_comments"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("notification_id", name=op.f("pk_notifications")),
+    )
+    op.create_index(
+        op.f("ix_notifications_notification_id"), "notifications", ["notification_id"]
+    )
+    op.create_index(
+        "ix_notifications_user_id_notification_id",
+        "notifications",
+        ["user_id", "notification_id"],
+    )
+    op.create_index(
+        "ix_notifications_user_id_is_read", "notifications", ["user_id", "is_read"]
+    )
+    op.create_index("ix_notifications_actor_id", "notifications", ["actor_id"])
+    op.create_index("ix_notifications_post_id", "notifications", ["post_id"])
+    op.create_index("ix_notifications_comment_id", "notifications", ["comment_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_notifications_comment_id", table_name="notifications")
+    op.drop_index("ix_notifications_post_id", table_name="notifications")
+    op.drop_index("ix_notifications_actor_id", table_name="notifications")
+    op.drop_index("ix_notifications_user_id_is_read", table_name="notifications")
+    op.drop_index(
+        "ix_notifications_user_id_notification_id", table_name="notifications"
+    )
+    op.drop_index(
+        op.f("ix_notifications_notification_id"), table_name="notifications"
+    )
+    op.drop_table("notifications")
@@ -0,0 +1,44 @@
+"""unique category status
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Concurrent startup seeding may have inserted duplicates: move their
+    # posts to the lowest category_id of each status, then drop the rest
+    op.execute(
+        "UPDATE posts SET category_id = ("
+        " SELECT MIN(keep.category_id) FROM categories AS keep"
+        " JOIN categories AS dup ON dup.category_status = keep.category_status"
+        " WHERE dup.category_id = posts.category_id)"
+    )
+    op.execute(
+        "DELETE FROM categories WHERE category_id NOT IN ("
+        " SELECT keep_id FROM (SELECT MIN(category_id) AS keep_id"
+        " FROM categories GROUP BY category_status) AS keep)"
+    )
+    with op.batch_alter_table("categories", schema=None) as batch_op:
+        batch_op.create_unique_constraint(
+            op.f("uq_categories_category_status"), ["category_status"]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("categories", schema=None) as batch_op:
+        batch_op.drop_constraint(op.f("uq_categories_category_status"), type_="unique")
@@ -0,0 +1,108 @@
+"""Tests run against a throwaway database, set up before app imports
+
+SQLite by default; set TEST_DATABASE_URL to run them against e.g. MySQL.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass
+
+os.environ["DATABASE_URL"] = os.getenv(
+    "TEST_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db"
+)
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("REPLICA_DATABASE_URLS", None)
+os.environ.pop("REDIS_URL", None)
+
+import pytest  # noqa: E402
+
+from app import search  # noqa: E402
+from app.cache import response_cache  # noqa: E402
+from app.comment_tree import path_segment  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Category,
+    CategoryStatus,
+    Comment,
+    Like,
+    Post,
+    User,
+)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+        response_cache.backend.clear()
+        search._backends.clear()  # the in-process index outlives the tables
+
+
+@dataclass
+class Seeded:
+    user_id: int
+    admin_id: int
+    category_id: int
+    post_ids: list
+    comment_id: int  # a top-level comment on post_ids[0], with a reply
+
+
+@pytest.fixture
+def seeded(db) -> Seeded:
+    """A few posts by several users, with comments, a reply and likes"""
+    category = Category(category_status=CategoryStatus.FREE)
+    users = [User(social_id=f"user{i}", nickname=f"user{i}") for i in range(3)]
+    admin = User(social_id="admin", nickname="admin", is_admin=True)
+    db.add_all([category, *users, admin])
+    db.flush()
+    posts = [
+        Post(
+            title=f"검색 게시글 {i}",
+            content="본문",
+            category_id=category.category_id,
+            user_id=users[i % len(users)].user_id,
+        )
+        for i in range(5)
+    ]
+    db.add_all(posts)
+    db.flush()
+    post = posts[0]
+    comments = [
+        Comment(content="댓글", post_id=post.post_id, user_id=user.user_id)
+        for user in users
+    ]
+    db.add_all(comments)
+    db.flush()
+    for comment in comments:
+        comment.path = path_segment(comment.comment_id)
+    root = comments[0]
+    reply = Comment(
+        content="답글",
+        post_id=post.post_id,
+        user_id=users[1].user_id,
+        parent_id=root.comment_id,
+        depth=1,
+    )
+    db.add(reply)
+    db.flush()
+    reply.path = root.path + path_segment(reply.comment_id)
+    root.reply_count = 1
+    post.comment_count = len(comments) + 1
+    db.add_all(
+        Like(post_id=post.post_id, user_id=user.user_id, is_liked=True)
+        for user in users
+    )
+    post.like_count = len(users)
+    db.commit()
+    return Seeded(
+        user_id=users[0].user_id,
+        admin_id=admin.user_id,
+        category_id=category.category_id,
+        post_ids=[p.post_id for p in posts],
+        comment_id=root.comment_id,
+    )
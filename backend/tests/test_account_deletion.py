@@ -0,0 +1,70 @@
+from app.account_deletion import run_step
+from app.models import (
+    AccountDeletionJob,
+    Category,
+    CategoryStatus,
+    Comment,
+    Like,
+    Post,
+    User,
+)
+
+
+def _run_until(db, job, phase):
+    for _ in range(20):
+        if job.phase == phase:
+            return
+        assert run_step(db, job, chunk_size=10)
+    raise AssertionError(f"job never reached the {phase} phase")
+
+
+def test_rows_written_during_deletion_are_deleted_before_the_user(db):
+    category = Category(category_status=CategoryStatus.FREE)
+    author = User(social_id="author", nickname="author")
+    leaving = User(social_id="leaving", nickname="leaving", is_active=False)
+    db.add_all([category, author, leaving])
+    db.flush()
+    other_post = Post(
+        title="t", content="c", category_id=category.category_id, user_id=author.user_id
+    )
+    db.add_all(
+        [
+            other_post,
+            Post(
+                title="t",
+                content="c",
+                category_id=category.category_id,
+                user_id=leaving.user_id,
+            ),
+        ]
+    )
+    db.flush()
+    author_id, leaving_id = author.user_id, leaving.user_id
+    job = AccountDeletionJob(user_id=leaving_id)
+    db.add(job)
+    db.commit()
+
+    _run_until(db, job, "user")
+    # Another worker's cached principal still lets the user write
+    db.add_all(
+        [
+            Comment(
+                content="late",
+                post_id=other_post.post_id,
+                user_id=leaving.user_id,
+                path="",
+            ),
+            Like(post_id=other_post.post_id, user_id=leaving_id, is_liked=True),
+        ]
+    )
+    db.commit()
+
+    assert run_step(db, job, chunk_size=10)
+    assert job.phase == "comments"
+    for _ in range(20):
+        if not run_step(db, job, chunk_size=10):
+            break
+    assert job.status == "done"
+    assert db.get(User, leaving_id) is None
+    assert db.get(User, author_id) is not None
+    assert (job.posts_deleted, job.comments_deleted, job.likes_deleted) == (1, 1, 1)
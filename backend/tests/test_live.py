@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from app.live import LIVE_REPLAY_LIMIT, RESET_EVENT, LiveBroker, LocalPubSub
+
+
+def first_frames(missed: int, count: int) -> list:
+    """The first `count` frames of a stream resumed `missed` events back"""
+
+    async def replay(after_event_id: int, limit: int):
+        last = after_event_id + missed
+        return [
+            (event_id, "post", {}) for event_id in range(after_event_id + 1, last + 1)
+        ][:limit]
+
+    async def main():
+        broker = LiveBroker(LocalPubSub())
+        await broker.startup()
+        stream = broker.stream("posts:-1", 10, replay)
+        try:
+            return [await stream.__anext__() for _ in range(count)]
+        finally:
+            await stream.aclose()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("missed", [1, LIVE_REPLAY_LIMIT])
+def test_missed_events_are_replayed(missed):
+    frames = first_frames(missed, 1 + missed)
+    assert frames[1].startswith("id: 11\n")
+    assert frames[-1].startswith(f"id: {10 + missed}\n")
+
+
+def test_a_gap_longer_than_the_replay_resets_the_client():
+    frames = first_frames(LIVE_REPLAY_LIMIT + 1, 2)
+    assert frames[1] == RESET_EVENT
@@ -0,0 +1,35 @@
+"""Statement budgets of the read endpoints, so an N+1 can't slip in.
+
+The seeded post has comments by several users and a reply; loading any of
+them per row would add statements. The response cache is cleared first so
+the database path is what gets counted.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache import response_cache
+from app.database import count_queries, engine
+from app.main import app
+
+BUDGETS = [
+    ("/api/posts", 1),
+    ("/api/posts?sort=likes&limit=2", 1),
+    # the post with its author, comments with their authors, images
+    ("/api/posts/{post_id}", 3),
+    ("/api/posts/{post_id}/comments", 1),
+    ("/api/posts/{post_id}/threads", 1),
+    # the root comment's path, then the subtree
+    ("/api/comments/{comment_id}/replies", 2),
+]
+
+
+@pytest.mark.parametrize("path,budget", BUDGETS)
+def test_read_endpoint_statement_count(seeded, path, budget):
+    client = TestClient(app)
+    url = path.format(post_id=seeded.post_ids[0], comment_id=seeded.comment_id)
+    response_cache.backend.clear()
+    with count_queries(engine) as statements:
+        response = client.get(url)
+    assert response.status_code == 200, response.text
+    assert len(statements) == budget, "\n".join(statements)
@@ -0,0 +1,124 @@
+"""EXPLAIN the statements the hot read endpoints execute.
+
+Each request below goes through the app (with the response cache cleared),
+every SELECT it runs is captured with its parameters, and the test fails if
+EXPLAIN (MySQL) or EXPLAIN QUERY PLAN (SQLite) shows a full table scan. The
+statements are the ones the handlers build, so a changed query is checked
+as soon as it ships.
+
+MySQL picks plans from table statistics; run it there with TEST_DATABASE_URL
+against representative volumes rather than this small fixture.
+"""
+
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.cache import response_cache
+from app.database import async_engine, engine
+from app.main import app, create_access_token
+from app.pagination import encode_cursor
+
+# "SCAN t" reads the whole table; "SCAN t USING INDEX i" walks index i in
+# order, which is a full scan too unless the ORDER BY is served by it (then
+# LIMIT stops it early)
+_SQLITE_SCAN_RE = re.compile(r"^SCAN (?!CONSTANT ROW)(\w+)( USING (COVERING )?INDEX)?")
+
+CURSOR = encode_cursor(datetime(2100, 1, 1), 1_000_000)
+REQUESTS = [
+    "/api/posts",
+    "/api/posts?category_id={category_id}",
+    f"/api/posts?category_id={{category_id}}&cursor={CURSOR}",
+    "/api/posts?sort=likes",
+    f"/api/posts?sort=likes&cursor={encode_cursor(10, 1_000_000)}",
+    "/api/posts?sort=comments",
+    "/api/posts?keyword=검색",
+    "/api/posts/search?q=검색",
+    f"/api/posts/search?q=검색&cursor={encode_cursor(1.0, 1_000_000)}",
+    "/api/posts/{post_id}",
+    "/api/posts/{post_id}/comments",
+    "/api/posts/{post_id}/threads",
+    f"/api/posts/{{post_id}}/threads?cursor={encode_cursor(0)}",
+    "/api/comments/{comment_id}/replies",
+    "/api/export/posts?since=2000-01-01T00:00:00",
+]
+
+
+@contextmanager
+def captured_selects():
+    """(statement, parameters) of every SELECT run on the app's engines"""
+    selects = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append((statement, parameters))
+
+    binds = (engine, async_engine.sync_engine)
+    for bind in binds:
+        event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield selects
+    finally:
+        for bind in binds:
+            event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+def full_scans(conn, statement, parameters):
+    """Return (plan lines, full-scanned tables) for one statement"""
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        details = [row[-1] for row in rows]
+        sorted_after = any("TEMP B-TREE FOR ORDER BY" in line for line in details)
+        scans = [
+            m.group(1)
+            for m in map(_SQLITE_SCAN_RE.match, details)
+            if m and (m.group(2) is None or sorted_after)
+        ]
+        return details, scans
+
+    rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings()
+    details = []
+    scans = []
+    for row in rows:
+        details.append(
+            f"{row['table']}: type={row['type']} key={row['key']} extra={row['Extra']}"
+        )
+        if row["type"] == "ALL":
+            scans.append(row["table"])
+    return details, scans
+
+
+@pytest.fixture
+def client(seeded):
+    client = TestClient(app)
+    # The in-process search index loads every post once; keep that out
+    client.get("/api/posts/search?q=warmup")
+    return client
+
+
+@pytest.mark.parametrize("path", REQUESTS)
+def test_hot_queries_use_indexes(seeded, client, path):
+    admin = {
+        "Authorization": "Bearer " + create_access_token({"sub": str(seeded.admin_id)})
+    }
+    url = path.format(
+        category_id=seeded.category_id,
+        post_id=seeded.post_ids[0],
+        comment_id=seeded.comment_id,
+    )
+    response_cache.backend.clear()
+    with captured_selects() as selects:
+        response = client.get(url, headers=admin)
+    assert response.status_code == 200, response.text
+    assert selects, "the request ran no query"
+
+    with engine.connect() as conn:
+        for statement, parameters in selects:
+            details, scans = full_scans(conn, statement, parameters)
+            assert not scans, f"full scan of {scans} in:\n{statement}\n" + "\n".join(
+                details
+            )
@@ -0,0 +1,36 @@
+import ipaddress
+
+import pytest
+from starlette.requests import Request
+
+from app import ratelimit
+from app.ratelimit import client_ip
+
+
+def request_from(peer: str, forwarded_for: str = None) -> Request:
+    headers = []
+    if forwarded_for is not None:
+        headers.append((b"x-forwarded-for", forwarded_for.encode()))
+    return Request({"type": "http", "client": (peer, 4321), "headers": headers})
+
+
+@pytest.fixture(autouse=True)
+def proxy(monkeypatch):
+    monkeypatch.setattr(
+        ratelimit, "TRUSTED_PROXIES", [ipaddress.ip_network("10.0.0.0/8")]
+    )
+
+
+@pytest.mark.parametrize(
+    "peer,forwarded_for,expected",
+    [
+        # direct clients can't pick their key
+        ("203.0.113.9", "198.51.100.1", "203.0.113.9"),
+        ("10.0.0.2", None, "10.0.0.2"),
+        ("10.0.0.2", "198.51.100.1", "198.51.100.1"),
+        # a spoofed leftmost hop is skipped, as are chained proxies
+        ("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.3", "198.51.100.1"),
+    ],
+)
+def test_client_ip(peer, forwarded_for, expected):
+    assert client_ip(request_from(peer, forwarded_for)) == expected
@@ -0,0 +1,65 @@
+"""Redis calls made from async handlers must not block the event loop"""
+
+import asyncio
+import threading
+
+from app.cache import RedisCacheBackend, ResponseCache
+from app.kvstore import FakeRedis
+from app.live import LiveBroker, RedisPubSub
+from app.notifications import NotificationService, RedisUnreadStore
+
+
+class RecordingRedis(FakeRedis):
+    """Notes the thread each command runs on"""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def smembers(self, key):
+        self.threads.add(threading.get_ident())
+        return super().smembers(key)
+
+    def publish(self, channel, message):
+        self.threads.add(threading.get_ident())
+        return 0
+
+
+def run_on_loop(call) -> int:
+    """Await call() and return the event loop's thread id"""
+
+    async def main():
+        await call()
+        return threading.get_ident()
+
+    return asyncio.run(main())
+
+
+def test_cache_invalidation_runs_in_the_threadpool():
+    client = RecordingRedis()
+    cache = ResponseCache(RedisCacheBackend(client))
+    loop_thread = run_on_loop(lambda: cache.invalidate_async("posts"))
+    assert client.threads and loop_thread not in client.threads
+
+
+def test_live_publish_runs_in_the_threadpool():
+    client = RecordingRedis()
+    broker = LiveBroker(RedisPubSub(client))
+    loop_thread = run_on_loop(lambda: broker.publish("posts:-1", 1, "post", {}))
+    assert client.threads and loop_thread not in client.threads
+
+
+def test_unread_cache_hit_runs_in_the_threadpool():
+    client = RecordingRedis()
+    client.set(RedisUnreadStore._key(1), 3)
+    service = NotificationService(RedisUnreadStore(client))
+
+    async def count():
+        assert await service.unread_count(None, 1) == 3
+
+    loop_thread = run_on_loop(count)
+    assert client.threads and loop_thread not in client.threads
@@ -0,0 +1,76 @@
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app import replicas
+from app.cache import response_cache
+from app.database import engine
+from app.main import app, create_access_token
+from app.models import Category, CategoryStatus, Post, User
+from app.replicas import InMemoryStickyStore, ReplicaRouter
+
+
+@pytest.fixture
+def post_id(db):
+    category = Category(category_status=CategoryStatus.FREE)
+    user = User(social_id="author", nickname="author")
+    db.add_all([category, user])
+    db.flush()
+    post = Post(
+        title="original",
+        content="c",
+        category_id=category.category_id,
+        user_id=user.user_id,
+    )
+    db.add(post)
+    db.commit()
+    return post.post_id
+
+
+@pytest.fixture
+def lagging_replica(post_id, tmp_path, monkeypatch):
+    """A replica holding a snapshot of the primary that never replays writes"""
+    path = tmp_path / "replica.db"
+    shutil.copy(engine.url.database, path)
+    replica_engine = create_engine(f"sqlite:///{path}")
+    router = ReplicaRouter([replica_engine], InMemoryStickyStore())
+    router.check()
+    monkeypatch.setattr(replicas, "replica_router", router)
+    response_cache.backend.clear()
+    yield router
+    response_cache.backend.clear()
+    replica_engine.dispose()
+
+
+def test_writer_reads_its_write_past_a_lagging_replica(post_id, lagging_replica):
+    client = TestClient(app)
+    author = {"Authorization": "Bearer " + create_access_token({"sub": "1"})}
+    url = f"/api/posts/{post_id}"
+
+    response = client.put(url, json={"title": "edited"}, headers=author)
+    assert response.status_code == 200
+
+    # Others read the replica, which has not caught up yet
+    response = client.get(url)
+    assert response.json()["title"] == "original"
+
+    # The author is pinned to the primary and must not get that stale body
+    response = client.get(url, headers=author)
+    assert response.json()["title"] == "edited"
+
+    # The primary's body is cached; the replica's was not, as it may be stale
+    assert client.get(url, headers=author).headers["x-cache"] == "HIT"
+    response = client.get(url)
+    assert response.headers["x-cache"] == "HIT"
+    assert response.json()["title"] == "edited"
+
+
+@pytest.mark.parametrize("path", ["/api/posts", "/api/posts/{post_id}"])
+def test_replica_bodies_are_cached(post_id, lagging_replica, path):
+    client = TestClient(app)
+    url = path.format(post_id=post_id)
+
+    assert client.get(url).headers["x-cache"] == "MISS"
+    assert client.get(url).headers["x-cache"] == "HIT"
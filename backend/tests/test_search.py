@@ -0,0 +1,27 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.pagination import encode_cursor
+
+
+def test_search_pages_cover_every_hit_once(seeded):
+    client = TestClient(app)
+    seen = []
+    params = {"q": "검색", "limit": 2}
+    while True:
+        response = client.get("/api/posts/search", params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        seen += [item["post_id"] for item in page["items"]]
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == sorted(seeded.post_ids, reverse=True)
+
+
+def test_search_rejects_an_offset_cursor(seeded):
+    client = TestClient(app)
+    response = client.get(
+        "/api/posts/search", params={"q": "검색", "cursor": encode_cursor(20)}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,39 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from app import views
+from app.database import async_engine
+from app.models import Post
+from app.views import InMemoryViewStore, ViewCounter
+
+
+class SlowBind:
+    """Holds each transaction back, so a flush can be caught in flight"""
+
+    def __init__(self, bind, delay: float):
+        self.bind = bind
+        self.delay = delay
+
+    @asynccontextmanager
+    async def begin(self):
+        await asyncio.sleep(self.delay)
+        async with self.bind.begin() as conn:
+            yield conn
+
+
+def test_views_drained_before_shutdown_are_written(seeded, db, monkeypatch):
+    monkeypatch.setattr(views, "async_engine", SlowBind(async_engine, 0.2))
+    post_id = seeded.post_ids[0]
+
+    async def serve_then_shut_down():
+        counter = ViewCounter(InMemoryViewStore(), dedupe_seconds=0)
+        counter.record(post_id)
+        task = asyncio.create_task(counter.run(interval=0))
+        await asyncio.sleep(0.05)  # run() has drained the view and is flushing
+        task.cancel()  # as the lifespan does, followed by a final flush
+        await asyncio.gather(task, return_exceptions=True)
+        await counter.flush()
+        await async_engine.dispose()
+
+    asyncio.run(serve_then_shut_down())
+    assert db.get(Post, post_id).view_count == 1
@@ -1,7 +1,8 @@
-import React, { useState } from 'react';
+import React, { useId, useState } from 'react';
 
-const CommentForm = ({ onSubmit }) => {
+const CommentForm = ({ onSubmit, label = '댓글 작성', placeholder = '댓글을 입력하세요...' }) => {
   const [content, setContent] = useState('');
+  const inputId = useId();
   const isLoggedIn = Boolean(localStorage.getItem('access_token'));
 
   if (!isLoggedIn) {
@@ -24,15 +25,15 @@ const CommentForm = ({ onSubmit }) => {
       className="mb-4 bg-white rounded-lg shadow p-4"
     >
       <div className="mb-3">
-        <label htmlFor="commentContent" className="block text-sm font-medium text-gray-700 mb-2">
-          댓글 작성
+        <label htmlFor={inputId} className="block text-sm font-medium text-gray-700 mb-2">
+          {label}
         </label>
         <textarea
-          id="commentContent"
+          id={inputId}
           rows={3}
           value={content}
           onChange={e => setContent(e.target.value)}
-          placeholder="댓글을 입력하세요..."
+          placeholder={placeholder}
           required
           className="w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:ring-blue-500 focus:border-blue-500"
         />
@@ -42,7 +43,7 @@ const CommentForm = ({ onSubmit }) => {
           type="submit"
           className="px-4 py-2 bg-blue-600 text-white rounded-md hover:bg-blue-700 focus:outline-none focus:ring-2 focus:ring-blue-500 focus:ring-offset-2"
         >
-          댓글 작성
+          {label}
         </button>
       </div>
     </form>
@@ -1,49 +1,130 @@
-import React from 'react';
+import React, { useState } from 'react';
+import CommentForm from './CommentForm';
 
-const CommentList = ({ comments, onDelete, currentUserId }) => (
+const CommentItem = ({ comment, rootId, currentUserId, onDelete, onReply }) => {
+  const [isReplying, setIsReplying] = useState(false);
+
+  return (
+    <div
+      className="bg-white rounded-lg shadow p-4"
+      style={{ marginLeft: `${comment.depth * 1.5}rem` }}
+    >
+      <div className="flex justify-between items-start">
+        <div className="flex items-center">
+          <img
+            src={comment.user?.profile_image || '/default-avatar.png'}
+            alt="프로필"
+            className="w-8 h-8 rounded-full mr-3"
+          />
+          <div>
+            <div className="font-medium text-gray-900">
+              {comment.user?.nickname || '익명'}
+            </div>
+            <div className="text-sm text-gray-500">
+              {new Date(comment.created_at).toLocaleString('ko-KR', {
+                year: 'numeric',
+                month: 'long',
+                day: 'numeric',
+                hour: '2-digit',
+                minute: '2-digit'
+              })}
+            </div>
+          </div>
+        </div>
+        <div className="flex items-center">
+          <button
+            className="text-sm text-gray-600 hover:text-gray-800 px-2 py-1 rounded hover:bg-gray-50"
+            onClick={() => setIsReplying(!isReplying)}
+          >
+            답글
+          </button>
+          {currentUserId === comment.user_id && (
+            <button
+              className="text-sm text-red-600 hover:text-red-800 px-2 py-1 rounded hover:bg-red-50"
+              onClick={() => onDelete(comment.comment_id)}
+            >
+              삭제
+            </button>
+          )}
+        </div>
+      </div>
+      <div className="mt-3 text-gray-700">{comment.content}</div>
+      {isReplying && (
+        <div className="mt-3">
+          <CommentForm
+            label="답글 작성"
+            placeholder="답글을 입력하세요..."
+            onSubmit={content => {
+              setIsReplying(false);
+              onReply(rootId, comment.comment_id, content);
+            }}
+          />
+        </div>
+      )}
+    </div>
+  );
+};
+
+const CommentList = ({
+  comments,
+  replies = {},
+  hasMore,
+  currentUserId,
+  onDelete,
+  onLoadMore,
+  onLoadReplies,
+  onReply,
+}) => (
   <div className="space-y-4">
     <h3 className="text-lg font-semibold text-gray-900">댓글</h3>
     {comments.length === 0 ? (
       <p className="text-gray-500">아직 댓글이 없습니다.</p>
     ) : (
-      comments.map(comment => (
-        <div className="bg-white rounded-lg shadow p-4" key={comment.comment_id}>
-          <div className="flex justify-between items-start">
-            <div className="flex items-center">
-              <img 
-                src={comment.user?.profile_image || '/default-avatar.png'} 
-                alt="프로필" 
-                className="w-8 h-8 rounded-full mr-3"
+      comments.map(comment => {
+        const thread = replies[comment.comment_id];
+        const showRepliesButton = thread ? Boolean(thread.nextCursor) : comment.reply_count > 0;
+        return (
+          <div className="space-y-2" key={comment.comment_id}>
+            <CommentItem
+              comment={comment}
+              rootId={comment.comment_id}
+              currentUserId={currentUserId}
+              onDelete={onDelete}
+              onReply={onReply}
+            />
+            {thread?.items.map(reply => (
+              <CommentItem
+                key={reply.comment_id}
+                comment={reply}
+                rootId={comment.comment_id}
+                currentUserId={currentUserId}
+                onDelete={onDelete}
+                onReply={onReply}
               />
-              <div>
-                <div className="font-medium text-gray-900">
-                  {comment.user?.nickname || '익명'}
-                </div>
-                <div className="text-sm text-gray-500">
-                  {new Date(comment.created_at).toLocaleString('ko-KR', {
-                    year: 'numeric',
-                    month: 'long',
-                    day: 'numeric',
-                    hour: '2-digit',
-                    minute: '2-digit'
-                  })}
-                </div>
-              </div>
-            </div>
-            {currentUserId === comment.user_id && (
+            ))}
+            {showRepliesButton && (
               <button
-                className="text-sm text-red-600 hover:text-red-800 px-2 py-1 rounded hover:bg-red-50"
-                onClick={() => onDelete(comment.comment_id)}
+                className="ml-6 text-sm text-blue-600 hover:text-blue-800"
+                onClick={() => onLoadReplies(comment.comment_id)}
               >
-                삭제
+                {thread ? '답글 더 보기' : `답글 ${comment.reply_count}개 보기`}
               </button>
             )}
           </div>
-          <div className="mt-3 text-gray-700">{comment.content}</div>
-        </div>
-      ))
+        );
+      })
+    )}
+    {hasMore && (
+      <div className="text-center">
+        <button
+          className="px-4 py-2 text-sm text-gray-700 border border-gray-300 rounded-md hover:bg-gray-50"
+          onClick={onLoadMore}
+        >
+          댓글 더 보기
+        </button>
+      </div>
     )}
   </div>
 );
 
-export default CommentList;
\ No newline at end of file
+export default CommentList;
@@ -9,17 +9,19 @@ const PostCard = ({ post }) => (
       </span>
     </div>
     <h3 className="text-xl font-semibold mb-2">{post.title}</h3>
-    <p className="text-gray-600 mb-4">
-      {post.content.length > 100 ? post.content.slice(0, 100) + '...' : post.content}
-    </p>
+    {post.content && (
+      <p className="text-gray-600 mb-4">
+        {post.content.length > 100 ? post.content.slice(0, 100) + '...' : post.content}
+      </p>
+    )}
     <div className="flex justify-between items-center mb-4">
       <div className="flex items-center space-x-2">
         <img
           src={post.user?.profile_image || '/default-avatar.png'}
-          alt={post.user?.nickname || '익명'}
+          alt={post.user?.nickname || post.nickname || '익명'}
           className="w-6 h-6 rounded-full"
         />
-        <span className="text-sm text-gray-700">{post.user?.nickname || '익명'}</span>
+        <span className="text-sm text-gray-700">{post.user?.nickname || post.nickname || '익명'}</span>
       </div>
       <span className="text-sm text-gray-500">
         {post.created_at ? new Date(post.created_at).toLocaleString('ko-KR', { 
@@ -32,7 +34,9 @@ const PostCard = ({ post }) => (
       </span>
     </div>
     <div className="flex justify-between items-center">
-      <span className="text-sm text-gray-500">조회수: {post.view_count || 0}</span>
+      <span className="text-sm text-gray-500">
+        조회수: {post.view_count || 0} · 댓글: {post.comment_count || 0} · 좋아요: {post.like_count || 0}
+      </span>
       <Link 
         to={`/posts/${post.post_id}`} 
         className="px-4 py-2 bg-blue-500 text-white rounded hover:bg-blue-600 transition duration-300"
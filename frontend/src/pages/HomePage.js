@@ -6,9 +6,19 @@ const HomePage = () => {
   const [recentPosts, setRecentPosts] = useState([]);
 
   useEffect(() => {
-    fetch('/api/posts')
+    // Trending posts are served from a precomputed ranking; fall back to the
+    // latest posts while nothing has been ranked yet (e.g. an empty board)
+    fetch('/api/posts/popular?window=24h&limit=6')
       .then(res => res.json())
-      .then(data => setRecentPosts(data.slice(0, 6)));
+      .then(posts => {
+        if (posts.length > 0) {
+          setRecentPosts(posts);
+          return;
+        }
+        return fetch('/api/posts?limit=6')
+          .then(res => res.json())
+          .then(data => setRecentPosts(data.items));
+      });
   }, []);
 
   return (
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
 import { api } from '../api/client';
 import CommentList from '../components/CommentList';
@@ -9,6 +9,9 @@ const PostDetailPage = () => {
   const navigate = useNavigate();
   const [post, setPost] = useState(null);
   const [comments, setComments] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  // Loaded reply subtrees keyed by thread root: { items, nextCursor }
+  const [replies, setReplies] = useState({});
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState(null);
   const [currentUser, setCurrentUser] = useState(null);
@@ -26,11 +29,13 @@ const PostDetailPage = () => {
         setIsLoading(true);
         const [postResponse, commentsResponse] = await Promise.all([
           api.get(`/api/posts/${id}`),
-          api.get(`/api/posts/${id}/comments`)
+          api.get(`/api/posts/${id}/threads`)
         ]);
         
         setPost(postResponse.data);
-        setComments(commentsResponse.data);
+        setComments(commentsResponse.data.items);
+        setNextCursor(commentsResponse.data.next_cursor);
+        setReplies({});
       } catch (err) {
         console.error('Error fetching data:', err);
         setError(err.response?.data?.detail || '데이터를 불러올 수 없습니다.');
@@ -42,6 +47,33 @@ const PostDetailPage = () => {
     fetchData();
   }, [id]);
 
+  // New top-level comments arrive over SSE instead of polling; EventSource
+  // reconnects by itself and resumes with Last-Event-ID
+  const nextCursorRef = useRef(null);
+  nextCursorRef.current = nextCursor;
+
+  useEffect(() => {
+    const source = new EventSource(`${api.defaults.baseURL}/api/live/posts/${id}/comments`);
+    source.addEventListener('comment', event => {
+      const comment = JSON.parse(event.data);
+      // Replies show up when their thread is opened; new threads are only
+      // appended once every earlier page is loaded, to keep the order
+      if (comment.parent_id !== null || nextCursorRef.current) return;
+      setComments(prev => (
+        prev.some(c => c.comment_id === comment.comment_id) ? prev : [...prev, comment]
+      ));
+    });
+    // Sent instead of the missed comments when too many were missed to
+    // replay; reload the first page rather than show a list with a gap
+    source.addEventListener('reset', async () => {
+      const response = await api.get(`/api/posts/${id}/threads`);
+      setComments(response.data.items);
+      setNextCursor(response.data.next_cursor);
+      setReplies({});
+    });
+    return () => source.close();
+  }, [id]);
+
   const handleDelete = async () => {
     if (window.confirm('정말 삭제하시겠습니까?')) {
       try {
@@ -54,22 +86,76 @@ const PostDetailPage = () => {
     }
   };
 
+  const loadMoreComments = async () => {
+    const response = await api.get(`/api/posts/${id}/threads`, {
+      params: { cursor: nextCursor },
+    });
+    setComments([...comments, ...response.data.items]);
+    setNextCursor(response.data.next_cursor);
+  };
+
+  const loadReplies = async (rootId) => {
+    const loaded = replies[rootId];
+    const response = await api.get(`/api/comments/${rootId}/replies`, {
+      params: loaded?.nextCursor ? { cursor: loaded.nextCursor } : {},
+    });
+    setReplies({
+      ...replies,
+      [rootId]: {
+        items: [...(loaded?.items || []), ...response.data.items],
+        nextCursor: response.data.next_cursor,
+      },
+    });
+  };
+
   const handleCommentSubmit = async (content) => {
     try {
       const response = await api.post(`/api/posts/${id}/comments`, { content });
-      setComments([...comments, response.data]);
+      setComments(prev => (
+        prev.some(c => c.comment_id === response.data.comment_id) ? prev : [...prev, response.data]
+      ));
     } catch (error) {
       console.error('Failed to create comment:', error);
       alert(error.response?.data?.detail || '댓글 작성에 실패했습니다.');
     }
   };
 
+  const handleReplySubmit = async (rootId, parentId, content) => {
+    try {
+      await api.post(`/api/posts/${id}/comments`, { content, parent_id: parentId });
+      // Reload the thread so the reply lands in its place in the tree
+      const response = await api.get(`/api/comments/${rootId}/replies`);
+      setReplies({
+        ...replies,
+        [rootId]: { items: response.data.items, nextCursor: response.data.next_cursor },
+      });
+      setComments(comments.map(comment => (
+        comment.comment_id === parentId
+          ? { ...comment, reply_count: comment.reply_count + 1 }
+          : comment
+      )));
+    } catch (error) {
+      console.error('Failed to create reply:', error);
+      alert(error.response?.data?.detail || '답글 작성에 실패했습니다.');
+    }
+  };
+
   const handleCommentDelete = async (commentId) => {
     if (!window.confirm('댓글을 삭제하시겠습니까?')) return;
     
     try {
       await api.delete(`/api/posts/${id}/comments/${commentId}`);
-      setComments(comments.filter(comment => comment.comment_id !== commentId));
+      // Deleting a comment also deletes its replies (every path under it)
+      const removed = [...comments, ...Object.values(replies).flatMap(r => r.items)]
+        .find(comment => comment.comment_id === commentId);
+      const isRemoved = comment => removed && comment.path.startsWith(removed.path);
+      setComments(comments.filter(comment => !isRemoved(comment)));
+      setReplies(Object.fromEntries(
+        Object.entries(replies).map(([rootId, r]) => [
+          rootId,
+          { ...r, items: r.items.filter(comment => !isRemoved(comment)) },
+        ])
+      ));
     } catch (error) {
       console.error('Failed to delete comment:', error);
       alert(error.response?.data?.detail || '댓글 삭제에 실패했습니다.');
@@ -158,14 +244,40 @@ const PostDetailPage = () => {
           {post.content}
         </div>
 
+        {post.images?.length > 0 && (
+          <div className="grid grid-cols-2 md:grid-cols-3 gap-4 mb-8">
+            {post.images.map(image => {
+              const medium = image.thumbnails.medium;
+              return (
+                <a key={image.post_image_id} href={image.image_url} target="_blank" rel="noreferrer">
+                  <picture>
+                    {medium?.webp && <source srcSet={medium.webp} type="image/webp" />}
+                    <img
+                      src={medium?.jpeg || medium?.png || image.image_url}
+                      alt={image.original_filename || ''}
+                      loading="lazy"
+                      className="w-full rounded-lg object-cover"
+                    />
+                  </picture>
+                </a>
+              );
+            })}
+          </div>
+        )}
+
         <hr className="my-8 border-gray-200" />
 
         <div className="space-y-6">
           <CommentForm onSubmit={handleCommentSubmit} />
           <CommentList
             comments={comments}
+            replies={replies}
+            hasMore={Boolean(nextCursor)}
             currentUserId={currentUser?.user_id}
             onDelete={handleCommentDelete}
+            onLoadMore={loadMoreComments}
+            onLoadReplies={loadReplies}
+            onReply={handleReplySubmit}
           />
         </div>
       </div>
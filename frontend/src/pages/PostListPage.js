@@ -5,6 +5,7 @@ import PostCard from '../components/PostCard';
 
 const PostListPage = () => {
   const [posts, setPosts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [keyword, setKeyword] = useState('');
   const [categoryId, setCategoryId] = useState(-1);
   const [isLoading, setIsLoading] = useState(true);
@@ -16,7 +17,8 @@ const PostListPage = () => {
         setIsLoading(true);
         setError(null);
         const response = await api.get(`/api/posts?keyword=${encodeURIComponent(keyword)}&category_id=${categoryId}`);
-        setPosts(response.data);
+        setPosts(response.data.items);
+        setNextCursor(response.data.next_cursor);
       } catch (error) {
         console.error('Error fetching posts:', error);
         setError('게시글을 불러오는데 실패했습니다.');
@@ -27,6 +29,17 @@ const PostListPage = () => {
     fetchPosts();
   }, [keyword, categoryId]);
 
+  const loadMore = async () => {
+    try {
+      const response = await api.get(`/api/posts?keyword=${encodeURIComponent(keyword)}&category_id=${categoryId}&cursor=${nextCursor}`);
+      setPosts([...posts, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Error fetching posts:', error);
+      setError('게시글을 불러오는데 실패했습니다.');
+    }
+  };
+
   return (
     <div className="max-w-6xl mx-auto px-4 py-8">
       <div className="flex justify-between items-center mb-6">
@@ -63,6 +76,14 @@ const PostListPage = () => {
               게시글이 없습니다.
             </div>
           )}
+          {nextCursor && (
+            <button
+              onClick={loadMore}
+              className="w-full py-3 border border-gray-300 rounded-lg text-gray-700 hover:bg-gray-50"
+            >
+              더 보기
+            </button>
+          )}
         </div>
       )}
     </div>